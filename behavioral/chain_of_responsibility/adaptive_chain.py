@@ -0,0 +1,131 @@
+"""
+Cadeia adaptativa.
+
+Quando a maior parte das letras é tratada pelos últimos handlers, toda
+solicitação paga pelo percurso completo da cadeia. A cadeia adaptativa conta
+quantas letras cada handler tratou e, a cada reorder_every solicitações,
+reordena os handlers pela frequência observada (os mais usados primeiro).
+
+Só trocam de posição handlers marcados com order_independent = True, e
+apenas dentro de um trecho contínuo desses handlers. Um handler dependente
+de ordem funciona como uma barreira: ninguém passa por cima dele.
+
+A nova ordem é montada em uma tupla nova e publicada com uma única
+atribuição. Threads que estão roteando continuam usando a tupla que já
+leram; as próximas solicitações usam a nova. Os links de sucessor originais
+nunca são alterados.
+"""
+from threading import Lock
+from typing import Dict, List, Sequence, Tuple
+
+from chain_of_responsibility_2 import (Handler, HandlerABC, HandlerDEF,
+                                       HandlerUnsolved)
+from compiled_chain import WatchedChain, split_fallback
+
+
+def reorder_by_hits(handlers: Sequence[Handler],
+                    hits: Dict[Handler, int]) -> List[Handler]:
+    """ Ordena por hits cada trecho contínuo de handlers independentes """
+    ordered: List[Handler] = []
+    run: List[Handler] = []
+
+    for handler in handlers:
+        if handler.order_independent:
+            run.append(handler)
+            continue
+
+        ordered.extend(sorted(run, key=lambda h: -hits.get(h, 0)))
+        run = []
+        ordered.append(handler)
+
+    ordered.extend(sorted(run, key=lambda h: -hits.get(h, 0)))
+    return ordered
+
+
+class AdaptiveChain(WatchedChain):
+    def __init__(self, head: Handler, reorder_every: int = 10_000) -> None:
+        super().__init__(head)
+        self.reorder_every = reorder_every
+        self._lock = Lock()
+        self._calls = 0
+        self._hits: Dict[Handler, int] = {}
+        self._routing: Tuple[Tuple[Handler, ...], Handler, int] = (
+            (), head, -1
+        )
+        self.rebuild()
+
+    @property
+    def handlers(self) -> Tuple[Handler, ...]:
+        handlers, tail, _ = self._routing
+        return handlers + (tail,)
+
+    def rebuild(self) -> None:
+        """
+        Relê a cadeia a partir dos links de sucessor, mantendo a ordem já
+        aprendida: os handlers que continuam na cadeia preservam seus hits.
+        """
+        handlers, generation = self.watched_handlers()
+        routable, fallback = split_fallback(handlers)
+        self._hits = {handler: self._hits.get(handler, 0)
+                      for handler in [*routable, fallback]}
+        self._routing = (
+            tuple(reorder_by_hits(routable, self._hits)), fallback,
+            generation
+        )
+
+    def reorder(self) -> None:
+        # Só uma thread reordena por vez; as outras seguem roteando
+        if not self._lock.acquire(blocking=False):
+            return
+
+        try:
+            handlers, tail, version = self._routing
+            hits = self._hits
+            new_order = tuple(reorder_by_hits(handlers, hits))
+
+            # Reduz as contagens pela metade para que a ordem acompanhe
+            # mudanças no padrão de tráfego
+            self._hits = {handler: count // 2
+                          for handler, count in hits.items()}
+            self._calls = 0
+            self._routing = (new_order, tail, version)
+        finally:
+            self._lock.release()
+
+    def handle(self, letter: str) -> str:
+        handlers, handler, version = self._routing
+
+        if version != self._generation:
+            self.rebuild()
+            handlers, handler, version = self._routing
+
+        for candidate in handlers:
+            if letter in candidate.letters:
+                handler = candidate
+                break
+
+        # Contadores sem lock: podem perder um incremento ou outro entre
+        # threads, o que não atrapalha uma ordenação por frequência
+        hits = self._hits
+        hits[handler] = hits.get(handler, 0) + 1
+        self._calls += 1
+
+        if self._calls >= self.reorder_every:
+            self.reorder()
+
+        return handler.handle(letter)
+
+
+if __name__ == "__main__":
+    handler_unsolved = HandlerUnsolved()
+    handler_def = HandlerDEF(handler_unsolved)
+    handler_abc = HandlerABC(handler_def)
+
+    chain = AdaptiveChain(handler_abc, reorder_every=10)
+
+    print([handler.__class__.__name__ for handler in chain.handlers])
+
+    for letter in 'DEFDEFDEFA':
+        print(chain.handle(letter))
+
+    print([handler.__class__.__name__ for handler in chain.handlers])
@@ -0,0 +1,105 @@
+"""
+Cadeia assíncrona.
+
+Quando os handlers fazem I/O lento, tratar uma solicitação por vez limita a
+vazão ao tempo de resposta de cada uma. Com AsyncHandler cada handler
+aguarda o seu I/O com await e o AsyncDispatcher mantém muitas solicitações
+em andamento ao mesmo tempo.
+
+O dispatcher limita quantas solicitações ficam em andamento (concurrency):
+- handle espera uma vaga antes de entrar na cadeia;
+- handle_many só lê a próxima letra da entrada quando há vaga (a mesma
+  vaga usada por handle), então uma entrada enorme (ou infinita) não vira
+  milhares de tarefas na memória. Uma vaga volta a ser usada assim que
+  qualquer solicitação termina. Os resultados saem na ordem de entrada;
+  no máximo window resultados ficam guardados esperando o mais antigo.
+"""
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Deque, FrozenSet, Iterable, Optional
+
+from chain_of_responsibility_2 import AsyncHandler, AsyncHandlerUnsolved
+
+
+class AsyncHandlerLetters(AsyncHandler):
+    """ Handler que simula um I/O com latency segundos de espera """
+
+    def __init__(self, name: str, letters: FrozenSet[str],
+                 sucessor: AsyncHandler, latency: float = 0.0) -> None:
+        self.name = name
+        self.letters = letters
+        self.sucessor = sucessor
+        self.latency = latency
+
+    async def handle(self, letter: str) -> str:
+        if letter in self.letters:
+            await asyncio.sleep(self.latency)
+            return f'{self.name}: conseguiu tratar o valor {letter}'
+        return await self.sucessor.handle(letter)
+
+
+class AsyncDispatcher:
+    def __init__(self, head: AsyncHandler, concurrency: int = 1000,
+                 window: Optional[int] = None) -> None:
+        self.head = head
+        self.concurrency = concurrency
+        self.window = window or 4 * concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def handle(self, letter: str) -> str:
+        async with self._semaphore:
+            return await self.head.handle(letter)
+
+    def _release(self, task: asyncio.Task) -> None:
+        # Chamado quando a tarefa termina, falha ou é cancelada (mesmo
+        # antes de começar a rodar)
+        self._semaphore.release()
+
+    async def handle_many(self, letters: Iterable[str]) -> AsyncIterator[str]:
+        pending: Deque[asyncio.Task] = deque()
+
+        try:
+            for letter in letters:
+                # Resultados prontos no início da fila saem já
+                while pending and pending[0].done():
+                    yield pending.popleft().result()
+                # Limita quantos resultados esperam pelo mais antigo
+                if len(pending) >= self.window:
+                    yield await pending.popleft()
+
+                # Vaga compartilhada com handle: libera assim que qualquer
+                # solicitação termina, não apenas a mais antiga
+                await self._semaphore.acquire()
+                task = asyncio.ensure_future(self.head.handle(letter))
+                task.add_done_callback(self._release)
+                pending.append(task)
+
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+async def main() -> None:
+    handler_unsolved = AsyncHandlerUnsolved()
+    handler_def = AsyncHandlerLetters(
+        'AsyncHandlerDEF', frozenset('DEF'), handler_unsolved, latency=0.2
+    )
+    handler_abc = AsyncHandlerLetters(
+        'AsyncHandlerABC', frozenset('ABC'), handler_def, latency=0.1
+    )
+
+    dispatcher = AsyncDispatcher(handler_abc, concurrency=4)
+
+    async for result in dispatcher.handle_many('ABCDEFGHI'):
+        print(result)
+
+    print()
+    print(await asyncio.gather(
+        *(dispatcher.handle(letter) for letter in 'AGD')
+    ))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
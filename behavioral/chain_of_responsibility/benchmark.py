@@ -0,0 +1,317 @@
+"""
+Benchmarks das variações da cadeia de responsabilidade.
+
+Execute a partir desta pasta:
+    python benchmark.py
+"""
+import asyncio
+import random
+from collections import deque
+from threading import Event, Thread
+from time import perf_counter, sleep
+from timeit import timeit
+from typing import FrozenSet, List, Tuple
+
+from async_chain import AsyncDispatcher, AsyncHandlerLetters
+from chain_of_responsibility_2 import (AsyncHandlerUnsolved, Handler,
+                                       HandlerABC, HandlerDEF, HandlerPrefix,
+                                       HandlerUnsolved)
+from adaptive_chain import AdaptiveChain
+from chain_driver import ChainDriver
+from compiled_chain import CompiledChain, chain_handlers
+from hot_swap_chain import ChainContainer
+from trie_chain import TrieChain
+
+
+class HandlerLetters(Handler):
+    """ Handler genérico, usado para montar cadeias grandes """
+
+    # As letras de cada HandlerLetters do benchmark não se repetem
+    order_independent = True
+
+    def __init__(self, letters: FrozenSet[str], sucessor: Handler) -> None:
+        self.letters = letters
+        self.sucessor = sucessor
+
+    def handle(self, letter: str) -> str:
+        if letter in self.letters:
+            return f'HandlerLetters: conseguiu tratar o valor {letter}'
+        return self.sucessor.handle(letter)
+
+
+def build_chain(size: int, letters_per_handler: int) -> Handler:
+    handler: Handler = HandlerUnsolved()
+
+    for index in reversed(range(size)):
+        start = index * letters_per_handler
+        letters = frozenset(
+            f'K{key}' for key in range(start, start + letters_per_handler)
+        )
+        handler = HandlerLetters(letters, handler)
+
+    return handler
+
+
+def build_keys(size: int, letters_per_handler: int) -> List[str]:
+    total = size * letters_per_handler
+    # Inclui algumas chaves que ninguém trata (caem no HandlerUnsolved)
+    return [f'K{key}' for key in range(0, total + total // 10, 7)]
+
+
+def bench_compiled_chain(size: int = 300, letters_per_handler: int = 10,
+                         number: int = 5) -> None:
+    head = build_chain(size, letters_per_handler)
+    keys = build_keys(size, letters_per_handler)
+    chain = CompiledChain(head)
+
+    def recursive() -> None:
+        for key in keys:
+            head.handle(key)
+
+    def compiled() -> None:
+        for key in keys:
+            chain.handle(key)
+
+    assert [head.handle(key) for key in keys] == \
+        [chain.handle(key) for key in keys]
+
+    recursive_time = timeit(recursive, number=number)
+    compiled_time = timeit(compiled, number=number)
+
+    print(f'Cadeia com {size} handlers, {len(keys)} chaves x {number}')
+    print(f'  recursiva: {recursive_time:.4f}s')
+    print(f'  compilada: {compiled_time:.4f}s '
+          f'({recursive_time / compiled_time:.1f}x)')
+
+
+def bench_handle_many(size: int = 1_000_000, number: int = 1) -> None:
+    head = HandlerABC(HandlerDEF(HandlerUnsolved()))
+    chain = CompiledChain(head)
+    keys = 'ABCDEFGHIJ' * (size // 10)
+
+    def one_by_one() -> None:
+        deque((head.handle(key) for key in keys), maxlen=0)
+
+    def many() -> None:
+        deque(chain.handle_many(keys), maxlen=0)
+
+    assert list(chain.handle_many(keys[:1000])) == \
+        [head.handle(key) for key in keys[:1000]]
+
+    one_by_one_time = timeit(one_by_one, number=number)
+    many_time = timeit(many, number=number)
+
+    print(f'Fluxo de {len(keys)} letras x {number}')
+    print(f'  handle:      {one_by_one_time:.4f}s')
+    print(f'  handle_many: {many_time:.4f}s '
+          f'({one_by_one_time / many_time:.1f}x)')
+
+
+def bench_chain_driver(size: int = 300, letters_per_handler: int = 10,
+                       number: int = 5) -> None:
+    head = build_chain(size, letters_per_handler)
+    keys = build_keys(size, letters_per_handler)
+    driver = ChainDriver(head)
+    instrumented = ChainDriver(head, instrumented=True)
+
+    def recursive() -> None:
+        for key in keys:
+            head.handle(key)
+
+    def iterative() -> None:
+        for key in keys:
+            driver.handle(key)
+
+    def iterative_instrumented() -> None:
+        for key in keys:
+            instrumented.handle(key)
+
+    assert [head.handle(key) for key in keys] == \
+        [driver.handle(key) for key in keys]
+
+    recursive_time = timeit(recursive, number=number)
+    iterative_time = timeit(iterative, number=number)
+    instrumented_time = timeit(iterative_instrumented, number=number)
+
+    print(f'Cadeia com {size} handlers, {len(keys)} chaves x {number}')
+    print(f'  recursiva:              {recursive_time:.4f}s')
+    print(f'  driver:                 {iterative_time:.4f}s')
+    print(f'  driver (instrumentado): {instrumented_time:.4f}s')
+
+    # Uma cadeia longa demais para a versão recursiva
+    long_head = build_chain(20_000, 1)
+    last_key = 'K19999'
+    try:
+        long_head.handle(last_key)
+    except RecursionError:
+        print('  cadeia de 20000 handlers: recursiva -> RecursionError')
+    print(f'  cadeia de 20000 handlers: driver -> '
+          f'{ChainDriver(long_head).handle(last_key)}')
+
+
+def bench_adaptive_chain(size: int = 50, requests: int = 200_000) -> None:
+    head = build_chain(size, 1)
+    driver = ChainDriver(head)
+    chain = AdaptiveChain(head)
+
+    # 90% das chaves vão para o último handler antes do HandlerUnsolved
+    rng = random.Random(0)
+    keys = [f'K{size - 1}' if rng.random() < 0.9
+            else f'K{rng.randrange(size + 5)}' for _ in range(requests)]
+
+    def static() -> None:
+        for key in keys:
+            driver.handle(key)
+
+    def adaptive() -> None:
+        for key in keys:
+            chain.handle(key)
+
+    static_time = timeit(static, number=1)
+    adaptive_time = timeit(adaptive, number=1)
+
+    print(f'Cadeia com {size} handlers, {requests} solicitações')
+    print(f'  ordem fixa:     {static_time:.4f}s')
+    print(f'  ordem adaptada: {adaptive_time:.4f}s '
+          f'({static_time / adaptive_time:.1f}x)')
+
+    # Várias threads roteando enquanto a cadeia se reordena
+    chain = AdaptiveChain(head, reorder_every=500)
+    expected = {key: head.handle(key) for key in set(keys)}
+    errors: List[str] = []
+
+    def worker() -> None:
+        for key in keys[:50_000]:
+            if chain.handle(key) != expected[key]:
+                errors.append(key)
+
+    threads = [Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f'  4 threads reordenando a cada 500: {len(errors)} erros')
+
+
+def bench_async_chain(requests: int = 500, latency: float = 0.001) -> None:
+    head = AsyncHandlerLetters(
+        'AsyncHandlerABC', frozenset('ABC'), AsyncHandlerUnsolved(), latency
+    )
+    keys = 'A' * requests
+
+    async def sequential() -> None:
+        for key in keys:
+            await head.handle(key)
+
+    async def dispatched(concurrency: int) -> None:
+        dispatcher = AsyncDispatcher(head, concurrency)
+        async for _ in dispatcher.handle_many(keys):
+            pass
+
+    print(f'{requests} solicitações com {latency * 1000:.0f}ms de latência')
+    sequential_time = timeit(lambda: asyncio.run(sequential()), number=1)
+    print(f'  uma por vez:       {sequential_time:.4f}s')
+
+    for concurrency in (10, 100, 1000):
+        dispatched_time = timeit(
+            lambda: asyncio.run(dispatched(concurrency)), number=1
+        )
+        print(f'  concurrency={concurrency:<5} {dispatched_time:.4f}s')
+
+
+def bench_trie_chain(size: int = 500, number: int = 5) -> None:
+    head: Handler = HandlerUnsolved()
+    for index in reversed(range(size)):
+        head = HandlerPrefix(
+            f'Handler{index}', [f'/svc{index}/', f'/svc{index}/v2/'], head
+        )
+
+    chain = TrieChain(head)
+    keys = [f'/svc{index}/v2/items/{index}' for index in range(0, size, 3)]
+    keys += ['/unknown/path'] * 10
+
+    def recursive() -> None:
+        for key in keys:
+            head.handle(key)
+
+    def trie() -> None:
+        for key in keys:
+            chain.handle(key)
+
+    assert [head.handle(key) for key in keys] == \
+        [chain.handle(key) for key in keys]
+
+    recursive_time = timeit(recursive, number=number)
+    trie_time = timeit(trie, number=number)
+
+    print(f'Cadeia com {size} handlers de prefixo, {len(keys)} chaves '
+          f'x {number}')
+    print(f'  recursiva: {recursive_time:.4f}s')
+    print(f'  trie:      {trie_time:.4f}s '
+          f'({recursive_time / trie_time:.1f}x)')
+
+
+def bench_hot_swap_chain(size: int = 300, readers: int = 4,
+                         seconds: float = 1.0) -> None:
+    head = build_chain(size, 10)
+    keys = build_keys(size, 10)
+    handlers = chain_handlers(head)
+    container = ChainContainer(handlers)
+
+    # Todo resultado precisa vir de uma cadeia completa: a que tem o
+    # penúltimo handler ou a que não tem
+    allowed = {key: {head.handle(key),
+                     HandlerUnsolved().handle(key)} for key in keys}
+
+    def run(reconfigure: bool) -> Tuple[float, int, int]:
+        stop = Event()
+        counts = [0] * readers
+        swaps = 0
+        errors: List[str] = []
+
+        def reader(index: int) -> None:
+            while not stop.is_set():
+                for key in keys:
+                    if container.handle(key) not in allowed[key]:
+                        errors.append(key)
+                counts[index] += len(keys)
+
+        threads = [Thread(target=reader, args=(index,))
+                   for index in range(readers)]
+        start = perf_counter()
+        for thread in threads:
+            thread.start()
+
+        while perf_counter() - start < seconds:
+            if reconfigure:
+                # Remove e recoloca o último handler antes do unsolved
+                container.remove(handlers[-2])
+                container.insert(len(handlers) - 2, handlers[-2])
+                swaps += 2
+            sleep(0.001)
+
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        return sum(counts) / (perf_counter() - start), swaps, len(errors)
+
+    quiet, _, _ = run(reconfigure=False)
+    busy, swaps, errors = run(reconfigure=True)
+
+    print(f'{readers} leitores por {seconds:.0f}s, cadeia com {size} '
+          f'handlers')
+    print(f'  sem reconfiguração: {quiet:,.0f} solicitações/s')
+    print(f'  com {swaps} trocas:   {busy:,.0f} solicitações/s, '
+          f'{errors} erros')
+
+
+if __name__ == "__main__":
+    bench_compiled_chain()
+    bench_handle_many()
+    bench_chain_driver()
+    bench_adaptive_chain()
+    bench_async_chain()
+    bench_trie_chain()
+    bench_hot_swap_chain()
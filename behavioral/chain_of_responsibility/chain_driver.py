@@ -0,0 +1,99 @@
+"""
+Driver iterativo da cadeia.
+
+Cada handler da cadeia tradicional chama handle do seu sucessor, criando um
+frame na pilha a cada salto. Cadeias longas estouram o limite de recursão
+(RecursionError) e todo salto paga o custo de uma chamada de função.
+
+O ChainDriver percorre os links de sucessor num laço, usando as letras de
+cada handler para decidir onde parar, e só chama handle do handler que
+realmente trata a letra. Um handler sem letras (HandlerPrefix,
+HandlerUnsolved) decide sozinho, então o laço para nele e chama o seu
+handle. Funciona com os handlers que já existem, sem alterá-los.
+
+Com instrumented=True o driver também registra, por handler, quantas letras
+ele tratou (hits), quantas apenas repassou (passes) e o tempo acumulado em
+handle. Desligado, o driver usa um laço sem nenhuma contagem.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, DefaultDict
+
+from chain_of_responsibility_2 import (Handler, HandlerABC, HandlerDEF,
+                                       HandlerUnsolved)
+
+
+@dataclass
+class HandlerStats:
+    hits: int = 0
+    passes: int = 0
+    time: float = 0.0
+
+
+class ChainDriver:
+    def __init__(self, head: Handler, instrumented: bool = False) -> None:
+        self.head = head
+        self.stats: DefaultDict[Handler, HandlerStats] = defaultdict(
+            HandlerStats
+        )
+        self.handle: Callable[[str], str]
+        self.instrumented = instrumented
+
+    @property
+    def instrumented(self) -> bool:
+        return self._instrumented
+
+    @instrumented.setter
+    def instrumented(self, value: bool) -> None:
+        # Troca o método usado em handle, assim o caminho sem
+        # instrumentação não testa nenhuma flag a cada salto
+        self._instrumented = value
+        self.handle = self._handle_instrumented if value else self._handle
+
+    def _handle(self, letter: str) -> str:
+        handler = self.head
+
+        while handler.letters and letter not in handler.letters:
+            sucessor = getattr(handler, 'sucessor', None)
+            if sucessor is None:
+                break
+            handler = sucessor
+
+        return handler.handle(letter)
+
+    def _handle_instrumented(self, letter: str) -> str:
+        handler = self.head
+        stats = self.stats
+
+        while handler.letters and letter not in handler.letters:
+            sucessor = getattr(handler, 'sucessor', None)
+            if sucessor is None:
+                break
+            stats[handler].passes += 1
+            handler = sucessor
+
+        handler_stats = stats[handler]
+        start = perf_counter()
+        result = handler.handle(letter)
+        handler_stats.time += perf_counter() - start
+        handler_stats.hits += 1
+        return result
+
+    def reset_stats(self) -> None:
+        self.stats = defaultdict(HandlerStats)
+
+
+if __name__ == "__main__":
+    handler_unsolved = HandlerUnsolved()
+    handler_def = HandlerDEF(handler_unsolved)
+    handler_abc = HandlerABC(handler_def)
+
+    driver = ChainDriver(handler_abc, instrumented=True)
+
+    for letter in 'ABCDEFGHI':
+        print(driver.handle(letter))
+
+    print()
+    for handler, stats in driver.stats.items():
+        print(f'{handler.__class__.__name__}: {stats}')
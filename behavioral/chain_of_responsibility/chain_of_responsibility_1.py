@@ -1,33 +1,124 @@
 # Implementando com funções
+from functools import lru_cache
+from typing import (Callable, FrozenSet, Iterable, List, Optional, Protocol,
+                    Tuple)
 
+HandlerFunc = Callable[[str], str]
+CacheInfo = Tuple[int, int, Optional[int], int]
 
-def handler_ABC(letter: str) -> str:
-    letters = ['A', 'B', 'C']
 
-    if letter in letters:
+class CachedHandler(Protocol):
+    """ Função de handle envolvida por functools.lru_cache """
+
+    def __call__(self, letter: str) -> str: ...
+
+    def cache_info(self) -> CacheInfo: ...
+
+
+LETTERS_ABC = frozenset(['A', 'B', 'C'])
+LETTERS_DEF = frozenset(['D', 'E', 'F'])
+
+
+class FunctionChain:
+    """
+    Monta a cadeia a partir de funções registradas com decorators e a
+    percorre num laço, sem recursão: só a função que conhece a letra é
+    chamada.
+
+    Como a resposta depende apenas da letra, a cadeia pode ter um cache
+    LRU limitado a cache_size resultados. O cache é descartado sempre que
+    uma função é registrada ou removida.
+    """
+
+    def __init__(self, cache_size: Optional[int] = None) -> None:
+        self.cache_size = cache_size
+        self._handlers: List[Tuple[FrozenSet[str], HandlerFunc]] = []
+        self._unsolved: Optional[HandlerFunc] = None
+        self._cache: Optional[CachedHandler] = None
+        self.handle: HandlerFunc
+        self._rebuild()
+
+    def register(self, letters: Iterable[str]) -> \
+            Callable[[HandlerFunc], HandlerFunc]:
+        def decorator(func: HandlerFunc) -> HandlerFunc:
+            self._handlers.append((frozenset(letters), func))
+            self._rebuild()
+            return func
+        return decorator
+
+    def unsolved(self, func: HandlerFunc) -> HandlerFunc:
+        self._unsolved = func
+        self._rebuild()
+        return func
+
+    def unregister(self, func: HandlerFunc) -> None:
+        self._handlers = [
+            (letters, handler) for letters, handler in self._handlers
+            if handler is not func
+        ]
+        self._rebuild()
+
+    def cache_info(self) -> Optional[CacheInfo]:
+        """ (hits, misses, maxsize, currsize) ou None sem cache """
+        if self._cache is None:
+            return None
+        return self._cache.cache_info()
+
+    def _handle(self, letter: str) -> str:
+        for letters, handler in self._handlers:
+            if letter in letters:
+                return handler(letter)
+
+        if self._unsolved is None:
+            raise LookupError(f'Nenhum handler trata {letter}')
+        return self._unsolved(letter)
+
+    def _rebuild(self) -> None:
+        self._cache = None
+        self.handle = self._handle
+
+        if self.cache_size:
+            self._cache = lru_cache(maxsize=self.cache_size)(self._handle)
+            self.handle = self._cache
+
+
+chain = FunctionChain(cache_size=1024)
+
+
+# A cadeia decide qual função trata cada letra: as funções não chamam
+# umas às outras, então unregister tira a função da cadeia de verdade.
+# Chamadas diretas com letras de outra função seguem pela cadeia.
+@chain.register(LETTERS_ABC)
+def handler_ABC(letter: str) -> str:
+    if letter in LETTERS_ABC:
         return f'handler_ABC: conseguiu tratar o valor {letter}'
-    return handler_DEF(letter)
+    return chain.handle(letter)
 
 
+@chain.register(LETTERS_DEF)
 def handler_DEF(letter: str) -> str:
-    letters = ['D', 'E', 'F']
-
-    if letter in letters:
+    if letter in LETTERS_DEF:
         return f'handler_DEF: conseguiu tratar o valor {letter}'
-    return handler_unsolved(letter)
+    return chain.handle(letter)
 
 
+@chain.unsolved
 def handler_unsolved(letter: str) -> str:
     return f'handler_unsolved: não sei tratar {letter}'
 
 
+def handle(letter: str) -> str:
+    return chain.handle(letter)
+
+
 if __name__ == "__main__":
-    print(handler_ABC('A'))
-    print(handler_ABC('B'))
-    print(handler_ABC('C'))
-    print(handler_ABC('D'))
-    print(handler_ABC('E'))
-    print(handler_ABC('F'))
+    for letter in 'ABCDEFGHIABC':
+        print(handle(letter))
+
+    print(chain.cache_info())
     print(handler_ABC('G'))
-    print(handler_ABC('H'))
-    print(handler_ABC('I'))
+
+    # Remover um handler descarta o cache
+    chain.unregister(handler_DEF)
+    print(handle('D'))
+    print(chain.cache_info())
@@ -8,19 +8,72 @@ ao longo da cadeia até que um objeto a trate.
 """
 
 from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Any, FrozenSet, Iterable, List, Protocol, Sequence
+from weakref import WeakSet
+
+_watchers_lock = Lock()
+
+
+class ChainWatcher(Protocol):
+    """ Cadeia compilada que precisa saber quando um handler muda """
+
+    def invalidate(self) -> None: ...
 
 
 class Handler(ABC):
+    letters: FrozenSet[str] = frozenset()
+    # Prefixos de chaves tratados pelo handler (veja trie_chain.py)
+    prefixes: FrozenSet[str] = frozenset()
+    # Handlers que podem trocar de posição com seus vizinhos sem mudar o
+    # resultado da cadeia (ex.: letras que nenhum outro handler trata).
+    # Usado pela cadeia adaptativa (adaptive_chain.py).
+    order_independent: bool = False
+
     def __init__(self) -> None:
         self.sucessor: Handler
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in ('sucessor', 'letters', 'prefixes'):
+            # Avisa apenas as cadeias compiladas que contêm este handler
+            watchers = self.__dict__.get('_watchers')
+            if watchers:
+                with _watchers_lock:
+                    watchers = list(watchers)
+                for watcher in watchers:
+                    watcher.invalidate()
+
+    def watch(self, watcher: ChainWatcher) -> None:
+        """
+        Registra uma cadeia compilada (compiled_chain.py, trie_chain.py,
+        adaptive_chain.py) para ser avisada quando este handler trocar de
+        sucessor, letras ou prefixos. A referência é fraca.
+        """
+        with _watchers_lock:
+            watchers = self.__dict__.get('_watchers')
+            if watchers is None:
+                watchers = WeakSet()
+                super().__setattr__('_watchers', watchers)
+            watchers.add(watcher)
+
     @abstractmethod
     def handle(self, letter: str) -> str: pass
 
+    def handle_batch(self, letters: Sequence[str]) -> List[str]:
+        """
+        Trata um grupo de letras de uma vez. Usado pela cadeia compilada,
+        que entrega a cada handler as letras que ele mesmo trata; letras
+        que não são do handler seguem para o sucessor, como em handle.
+        """
+        return [self.handle(letter) for letter in letters]
+
 
 class HandlerABC(Handler):
+    order_independent = True
+
     def __init__(self, sucessor: Handler) -> None:
-        self.letters = ['A', 'B', 'C']
+        self.letters = frozenset(['A', 'B', 'C'])
         self.sucessor = sucessor
 
     def handle(self, letter: str) -> str:
@@ -28,10 +81,18 @@ class HandlerABC(Handler):
             return f'HandlerABC: conseguiu tratar o valor {letter}'
         return self.sucessor.handle(letter)
 
+    def handle_batch(self, letters: Sequence[str]) -> List[str]:
+        letters_owned = self.letters
+        return [f'HandlerABC: conseguiu tratar o valor {letter}'
+                if letter in letters_owned else self.sucessor.handle(letter)
+                for letter in letters]
+
 
 class HandlerDEF(Handler):
+    order_independent = True
+
     def __init__(self, sucessor: Handler) -> None:
-        self.letters = ['D', 'E', 'F']
+        self.letters = frozenset(['D', 'E', 'F'])
         self.sucessor = sucessor
 
     def handle(self, letter: str) -> str:
@@ -39,11 +100,55 @@ class HandlerDEF(Handler):
             return f'HandlerDEF: conseguiu tratar o valor {letter}'
         return self.sucessor.handle(letter)
 
+    def handle_batch(self, letters: Sequence[str]) -> List[str]:
+        letters_owned = self.letters
+        return [f'HandlerDEF: conseguiu tratar o valor {letter}'
+                if letter in letters_owned else self.sucessor.handle(letter)
+                for letter in letters]
+
+
+class HandlerPrefix(Handler):
+    """ Trata chaves de vários caracteres que começam com um dos prefixos """
+
+    def __init__(self, name: str, prefixes: Iterable[str],
+                 sucessor: Handler) -> None:
+        self.name = name
+        self.prefixes = frozenset(prefixes)
+        self.sucessor = sucessor
+
+    def handle(self, letter: str) -> str:
+        if letter.startswith(tuple(self.prefixes)):
+            return f'{self.name}: conseguiu tratar o valor {letter}'
+        return self.sucessor.handle(letter)
+
 
 class HandlerUnsolved(Handler):
     def handle(self, letter: str) -> str:
         return f'HandlerUnsolved: não tratou {letter}'
 
+    def handle_batch(self, letters: Sequence[str]) -> List[str]:
+        return [f'HandlerUnsolved: não tratou {letter}' for letter in letters]
+
+
+class AsyncHandler(ABC):
+    """
+    Contraparte assíncrona de Handler, para handlers que fazem I/O.
+    Veja async_chain.py para um dispatcher com várias solicitações
+    em andamento ao mesmo tempo.
+    """
+    letters: FrozenSet[str] = frozenset()
+
+    def __init__(self) -> None:
+        self.sucessor: AsyncHandler
+
+    @abstractmethod
+    async def handle(self, letter: str) -> str: pass
+
+
+class AsyncHandlerUnsolved(AsyncHandler):
+    async def handle(self, letter: str) -> str:
+        return f'AsyncHandlerUnsolved: não tratou {letter}'
+
 
 if __name__ == "__main__":
     handler_unsolved = HandlerUnsolved()
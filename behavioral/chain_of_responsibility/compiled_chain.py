@@ -0,0 +1,166 @@
+"""
+Cadeia compilada.
+
+Na cadeia tradicional cada handler testa se conhece a letra e, caso não
+conheça, repassa a solicitação para o seu sucessor. O custo de rotear uma
+letra cresce com o tamanho da cadeia.
+
+A cadeia compilada percorre os links de sucessor uma única vez e monta uma
+tabela letra -> handler. O roteamento passa a ser uma consulta no dicionário
+e o handler encontrado trata a letra diretamente. Letras desconhecidas caem
+no primeiro handler sem letras (normalmente HandlerUnsolved, ou um
+HandlerPrefix), que segue pela cadeia exatamente como na cadeia
+tradicional.
+
+handle_many roteia um fluxo de letras em blocos: as letras distintas de cada
+bloco são particionadas por handler numa única passada, cada handler trata o
+seu grupo de uma vez (handle_batch) e os resultados são devolvidos na ordem de
+entrada, bloco a bloco, para que a memória não cresça com o tamanho do fluxo.
+Como a resposta de um handler depende apenas da letra, cada letra distinta é
+tratada uma única vez por bloco.
+
+Ao compilar, a cadeia se registra em cada um dos seus handlers (watch).
+Quando um deles troca de sucessor ou de letras, só as cadeias que o contêm
+são invalidadas e recompiladas na próxima chamada.
+"""
+from itertools import islice
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from chain_of_responsibility_2 import (ChainWatcher, Handler, HandlerABC,
+                                       HandlerDEF, HandlerUnsolved)
+
+
+def chain_handlers(head: Handler,
+                   watcher: Optional[ChainWatcher] = None) -> List[Handler]:
+    """
+    Percorre os links de sucessor e retorna os handlers em ordem. Com
+    watcher, registra-o em cada handler antes de ler o seu sucessor, para
+    que nenhuma mudança feita durante o percurso passe despercebida.
+    """
+    handlers: List[Handler] = []
+    seen = set()
+    handler: Optional[Handler] = head
+
+    while handler is not None and id(handler) not in seen:
+        seen.add(id(handler))
+        if watcher is not None:
+            handler.watch(watcher)
+        handlers.append(handler)
+        handler = getattr(handler, 'sucessor', None)
+
+    return handlers
+
+
+def split_fallback(handlers: List[Handler]) -> Tuple[List[Handler], Handler]:
+    """
+    Separa os handlers roteáveis por letra do primeiro handler sem letras
+    (HandlerPrefix, HandlerUnsolved...), que decide sozinho em handle se
+    trata a chave. Ele recebe tudo o que a tabela não resolver e repassa
+    para o resto da cadeia como a cadeia tradicional.
+    """
+    for index, handler in enumerate(handlers):
+        if not handler.letters:
+            return handlers[:index], handler
+    return handlers, handlers[-1]
+
+
+def compile_table(handlers: List[Handler]) -> Dict[str, Handler]:
+    """ Monta a tabela letra -> handler (o primeiro da cadeia vence) """
+    table: Dict[str, Handler] = {}
+
+    for handler in handlers:
+        for letter in handler.letters:
+            table.setdefault(letter, handler)
+
+    return table
+
+
+class WatchedChain:
+    """
+    Base das cadeias compiladas. A geração é incrementada (com lock, para
+    nenhuma invalidação se perder) sempre que um dos handlers muda; o que
+    foi compilado guarda a geração lida antes de percorrer a cadeia.
+    """
+
+    def __init__(self, head: Handler) -> None:
+        self.head = head
+        self._generation = 0
+        self._generation_lock = Lock()
+
+    def invalidate(self) -> None:
+        with self._generation_lock:
+            self._generation += 1
+
+    def watched_handlers(self) -> Tuple[List[Handler], int]:
+        generation = self._generation
+        return chain_handlers(self.head, self), generation
+
+
+class CompiledChain(WatchedChain):
+    def __init__(self, head: Handler) -> None:
+        super().__init__(head)
+        self._compiled: Tuple[Dict[str, Handler], Handler, int] = (
+            {}, head, -1
+        )
+
+    def compile(self) -> None:
+        handlers, generation = self.watched_handlers()
+        routable, fallback = split_fallback(handlers)
+        self._compiled = (compile_table(routable), fallback, generation)
+
+    def handle(self, letter: str) -> str:
+        table, tail, version = self._compiled
+
+        if version != self._generation:
+            self.compile()
+            table, tail, version = self._compiled
+
+        return table.get(letter, tail).handle(letter)
+
+    def handle_many(self, letters: Iterable[str],
+                    chunk_size: int = 4096) -> Iterator[str]:
+        iterator = iter(letters)
+
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+
+            if self._compiled[2] != self._generation:
+                self.compile()
+            table, tail, _ = self._compiled
+
+            # Particiona as letras distintas do bloco por handler
+            groups: Dict[Handler, List[str]] = {}
+            for letter in dict.fromkeys(chunk):
+                groups.setdefault(table.get(letter, tail), []).append(letter)
+
+            resolved: Dict[str, str] = {}
+            for handler, group in groups.items():
+                resolved.update(zip(group, handler.handle_batch(group)))
+
+            results = map(resolved.__getitem__, chunk)
+            yield from results
+
+
+if __name__ == "__main__":
+    handler_unsolved = HandlerUnsolved()
+    handler_def = HandlerDEF(handler_unsolved)
+    handler_abc = HandlerABC(handler_def)
+
+    chain = CompiledChain(handler_abc)
+
+    for letter in 'ABCDEFGHI':
+        print(chain.handle(letter))
+
+    print()
+    for result in chain.handle_many('IHGFEDCBA'):
+        print(result)
+
+    print()
+    # Religando a cadeia: HandlerABC passa a apontar direto para o unsolved
+    handler_abc.sucessor = handler_unsolved
+
+    for letter in 'ABCDEFGHI':
+        print(chain.handle(letter))
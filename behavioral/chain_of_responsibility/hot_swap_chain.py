@@ -0,0 +1,117 @@
+"""
+Cadeia com troca a quente (copy-on-write).
+
+Reconfigurar a cadeia alterando o sucessor de handlers enquanto outras
+threads estão roteando pode fazer uma solicitação ver metade da cadeia
+antiga e metade da nova.
+
+O ChainContainer guarda um ChainSnapshot imutável: a ordem dos handlers e a
+tabela letra -> handler já compilada. Leitores só leem o atributo snapshot
+(sem lock) e roteiam por ele até o fim. Escritores copiam a lista de
+handlers, aplicam a mudança, compilam um snapshot novo e o publicam com uma
+única atribuição. Um lock serializa apenas os escritores.
+
+O snapshot também não segue os links de sucessor: as letras e os prefixos
+de cada handler são lidos ao compilar, e a chave vai para o primeiro
+handler do snapshot que a trata. Handlers sem letras nem prefixos
+(HandlerUnsolved) tratam qualquer chave. Um handler removido do container
+não recebe mais chaves, mesmo que outro handler ainda aponte para ele.
+
+Os links de sucessor dos handlers nunca são alterados pelo container.
+"""
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from chain_of_responsibility_2 import (Handler, HandlerABC, HandlerDEF,
+                                       HandlerUnsolved)
+from compiled_chain import chain_handlers
+
+
+class ChainSnapshot:
+    def __init__(self, handlers: Tuple[Handler, ...]) -> None:
+        if not handlers:
+            raise ValueError('O snapshot precisa de pelo menos um handler')
+
+        self.handlers = handlers
+        # letra -> (posição, handler); o primeiro da cadeia vence
+        self._table: Dict[str, Tuple[int, Handler]] = {}
+        # Handlers sem letras, em ordem, com os prefixos que tratam
+        # (nenhum prefixo: trata qualquer chave)
+        self._letterless: List[Tuple[int, Handler, Tuple[str, ...]]] = []
+
+        for position, handler in enumerate(handlers):
+            for letter in handler.letters:
+                self._table.setdefault(letter, (position, handler))
+            if not handler.letters:
+                prefixes = tuple(handler.prefixes)
+                self._letterless.append((position, handler, prefixes))
+                if not prefixes:
+                    # Nada depois de um handler que trata tudo é alcançado
+                    break
+
+    def handle(self, letter: str) -> str:
+        position, handler = self._table.get(
+            letter, (len(self.handlers), None)
+        )
+        found: Optional[Handler] = handler
+
+        for fallback_position, fallback, prefixes in self._letterless:
+            if fallback_position > position:
+                break
+            if not prefixes or letter.startswith(prefixes):
+                found = fallback
+                break
+
+        if found is None:
+            raise LookupError(f'Nenhum handler trata {letter}')
+        return found.handle(letter)
+
+
+class ChainContainer:
+    def __init__(self, handlers: Sequence[Handler]) -> None:
+        self._lock = Lock()
+        self.snapshot = ChainSnapshot(tuple(handlers))
+
+    @classmethod
+    def from_head(cls, head: Handler) -> 'ChainContainer':
+        return cls(chain_handlers(head))
+
+    def handle(self, letter: str) -> str:
+        return self.snapshot.handle(letter)
+
+    def update(self, change: Callable[[List[Handler]], None]) -> None:
+        """ Aplica change numa cópia da lista de handlers e publica """
+        with self._lock:
+            handlers = list(self.snapshot.handlers)
+            change(handlers)
+            self.snapshot = ChainSnapshot(tuple(handlers))
+
+    def publish(self, handlers: Sequence[Handler]) -> None:
+        self.update(lambda current: current.__setitem__(
+            slice(None), handlers
+        ))
+
+    def insert(self, index: int, handler: Handler) -> None:
+        self.update(lambda handlers: handlers.insert(index, handler))
+
+    def remove(self, handler: Handler) -> None:
+        self.update(lambda handlers: handlers.remove(handler))
+
+
+if __name__ == "__main__":
+    handler_unsolved = HandlerUnsolved()
+    handler_def = HandlerDEF(handler_unsolved)
+    handler_abc = HandlerABC(handler_def)
+
+    container = ChainContainer.from_head(handler_abc)
+    snapshot = container.snapshot
+
+    container.remove(handler_def)
+
+    for letter in 'ABCDEF':
+        print(container.handle(letter))
+
+    print()
+    # Quem já tinha o snapshot antigo continua vendo a cadeia antiga
+    for letter in 'ABCDEF':
+        print(snapshot.handle(letter))
@@ -0,0 +1,124 @@
+"""
+Cadeia por prefixos (trie).
+
+Handlers como HandlerPrefix declaram prefixos de chaves com vários
+caracteres. Na cadeia tradicional cada handler testa todos os seus
+prefixos antes de repassar a chave, então o custo cresce com o número de
+handlers.
+
+A TrieChain compila os prefixos de todos os handlers em uma única árvore
+de prefixos (trie). Uma chave é roteada andando na árvore caractere por
+caractere, em tempo proporcional ao tamanho da chave, seja qual for o
+número de handlers.
+
+As letras (HandlerABC, HandlerDEF) valem como chaves exatas: casam só com
+a chave inteira, ou seja, com o tamanho dela. Vence o casamento mais longo,
+seja de prefixo ou de letra; no empate vence o handler que vem primeiro na
+cadeia, como na cadeia tradicional. Chaves que não casam com nada caem no
+último handler da cadeia (HandlerUnsolved).
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from chain_of_responsibility_2 import (Handler, HandlerABC, HandlerPrefix,
+                                       HandlerUnsolved)
+from compiled_chain import WatchedChain
+
+# (posição na cadeia, handler)
+Entry = Tuple[int, Handler]
+# Cada nó é um dicionário caractere -> nó. A chave vazia (que nunca é um
+# caractere) guarda a entrada do prefixo que termina naquele nó.
+Node = Dict[str, Any]
+_HANDLER = ''
+
+
+def compile_trie(handlers: List[Handler]) -> Node:
+    root: Node = {}
+
+    for position, handler in enumerate(handlers):
+        for prefix in handler.prefixes:
+            node = root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node.setdefault(_HANDLER, (position, handler))
+
+    return root
+
+
+def compile_exact(handlers: List[Handler]) -> Dict[str, Entry]:
+    """ Tabela letra -> entrada (o primeiro da cadeia vence) """
+    table: Dict[str, Entry] = {}
+
+    for position, handler in enumerate(handlers):
+        for letter in handler.letters:
+            table.setdefault(letter, (position, handler))
+
+    return table
+
+
+def longest_prefix(root: Node, key: str) -> Tuple[int, Optional[Entry]]:
+    """ (tamanho do prefixo, entrada) do prefixo mais longo da chave """
+    node = root
+    found: Optional[Entry] = node.get(_HANDLER)
+    length = 0
+
+    for depth, char in enumerate(key, 1):
+        child = node.get(char)
+        if child is None:
+            break
+        node = child
+        if _HANDLER in node:
+            found = node[_HANDLER]
+            length = depth
+
+    return length, found
+
+
+class TrieChain(WatchedChain):
+    def __init__(self, head: Handler) -> None:
+        super().__init__(head)
+        self._compiled: Tuple[Node, Dict[str, Entry], Handler, int] = (
+            {}, {}, head, -1
+        )
+
+    def compile(self) -> None:
+        handlers, generation = self.watched_handlers()
+        self._compiled = (
+            compile_trie(handlers), compile_exact(handlers),
+            handlers[-1], generation
+        )
+
+    def handle(self, key: str) -> str:
+        trie, table, tail, version = self._compiled
+
+        if version != self._generation:
+            self.compile()
+            trie, table, tail, version = self._compiled
+
+        length, found = longest_prefix(trie, key)
+        exact = table.get(key)
+
+        # A letra casa com a chave inteira: perde só para um prefixo do
+        # mesmo tamanho que venha antes na cadeia
+        if exact is not None and (
+            found is None or length < len(key) or exact[0] < found[0]
+        ):
+            found = exact
+
+        handler = tail if found is None else found[1]
+        return handler.handle(key)
+
+
+if __name__ == "__main__":
+    handler_unsolved = HandlerUnsolved()
+    handler_users = HandlerPrefix(
+        'HandlerUsers', ['/users'], handler_unsolved
+    )
+    handler_admin = HandlerPrefix(
+        'HandlerAdmin', ['/users/admin', '/admin'], handler_users
+    )
+    handler_abc = HandlerABC(handler_admin)
+
+    chain = TrieChain(handler_abc)
+
+    for key in ['A', '/users/1', '/users/admin/2', '/admin', '/blog', 'Z']:
+        print(chain.handle(key))
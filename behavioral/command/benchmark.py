@@ -0,0 +1,114 @@
+"""
+Benchmarks das variações do padrão Command.
+
+Execute a partir desta pasta:
+    python benchmark.py
+"""
+import os
+from contextlib import redirect_stdout
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Tuple
+
+from command_1 import (Light, LightChangeColor, LightOnCommand,
+                       RemoteController)
+from command_checkpoints import CheckpointedRemoteController
+from command_journal import CommandJournal, JournaledRemoteController
+
+
+def build_remote(directory: str, group_size: int,
+                 snapshot_every: int) -> JournaledRemoteController:
+    remote = JournaledRemoteController(
+        CommandJournal(directory, group_size=group_size, max_delay=1.0),
+        snapshot_every=snapshot_every, history_capacity=1000,
+    )
+    add_buttons(remote)
+    return remote
+
+
+def add_buttons(remote: RemoteController) -> None:
+    for index in range(10):
+        light = Light(f'Luz {index}', 'Sala')
+        remote.button_add_command(f'on {index}', LightOnCommand(light))
+        remote.button_add_command(
+            f'color {index}', LightChangeColor(light, f'Cor {index}')
+        )
+
+
+def press_buttons(remote: JournaledRemoteController, presses: int) -> None:
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for press in range(presses):
+            kind = 'on' if press % 2 else 'color'
+            remote.button_pressed(f'{kind} {press % 10}')
+    remote.journal.close()
+
+
+def bench_journal_writes(presses: int = 20_000) -> None:
+    print(f'Gravação de {presses} comandos no journal')
+
+    for group_size in (1, 16, 256, 4096):
+        with TemporaryDirectory() as directory:
+            remote = build_remote(directory, group_size, 10**9)
+            start = perf_counter()
+            press_buttons(remote, presses)
+            elapsed = perf_counter() - start
+            print(f'  group_size={group_size:<5} {presses / elapsed:>10,.0f} '
+                  f'comandos/s, {remote.journal.commits} fsyncs')
+
+
+def bench_journal_replay(presses: int = 1_003_333) -> None:
+    print(f'Replay de um journal com {presses} comandos')
+
+    for snapshot_every in (10**9, 100_000, 10_000):
+        with TemporaryDirectory() as directory:
+            press_buttons(build_remote(directory, 4096, snapshot_every),
+                          presses)
+
+            restored = build_remote(directory, 4096, snapshot_every)
+            start = perf_counter()
+            count = restored.restore()
+            elapsed = perf_counter() - start
+            restored.journal.close()
+
+            label = 'sem snapshot' if snapshot_every == 10**9 \
+                else f'snapshot a cada {snapshot_every}'
+            print(f'  {label:<26} {elapsed:.4f}s, {count} registros lidos')
+
+
+def bench_rollback(depths: Tuple[int, ...] = (1_000, 10_000, 100_000)) \
+        -> None:
+    print('Voltar todo o histórico até o início')
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        results = []
+        for depth in depths:
+            remote = RemoteController()
+            checkpointed = CheckpointedRemoteController(checkpoint_every=1000)
+
+            for controller in (remote, checkpointed):
+                add_buttons(controller)
+                for press in range(depth):
+                    kind = 'on' if press % 2 else 'color'
+                    controller.button_pressed(f'{kind} {press % 10}')
+
+            start = perf_counter()
+            for _ in range(depth):
+                remote.global_undo()
+            step_by_step = perf_counter() - start
+
+            start = perf_counter()
+            checkpointed.undo_to(depth // 2)
+            checkpointed.undo_to(0)
+            checkpoints = perf_counter() - start
+
+            results.append((depth, step_by_step, checkpoints))
+
+    for depth, step_by_step, checkpoints in results:
+        print(f'  {depth:>7} passos: global_undo {step_by_step:.4f}s, '
+              f'undo_to (2 saltos) {checkpoints:.4f}s')
+
+
+if __name__ == "__main__":
+    bench_journal_writes()
+    bench_journal_replay()
+    bench_rollback()
@@ -11,7 +11,10 @@ ação no final).
 """
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from collections import deque
+from struct import calcsize
+from sys import getsizeof, intern
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
 
 
 class Light:
@@ -21,11 +24,14 @@ class Light:
         self.name = name
         self.room_name = room_name
         self.color = 'Default color'
+        self.is_on = False
 
     def on(self) -> None:
+        self.is_on = True
         print(f'{self.name} no {self.room_name} está ON')
 
     def off(self) -> None:
+        self.is_on = False
         print(f'{self.name} no {self.room_name} está OFF')
 
     def change_color(self, color: str) -> None:
@@ -56,6 +62,19 @@ class LightOnCommand(ICommand):
         self.light.off()
 
 
+class LightOffCommand(ICommand):
+    """ Comando concreto """
+
+    def __init__(self, light: Light) -> None:
+        self.light = light
+
+    def execute(self) -> None:
+        self.light.off()
+
+    def undo(self) -> None:
+        self.light.on()
+
+
 class LightChangeColor(ICommand):
     """ Comando concreto """
 
@@ -72,12 +91,154 @@ class LightChangeColor(ICommand):
         self.light.change_color(self._old_color)
 
 
+class MacroCommand(ICommand):
+    """
+    Comando composto por vários comandos, executados como um só.
+
+    Antes de executar, os comandos redundantes são removidos:
+    - trocas de cor seguidas na mesma luz: só a última fica;
+    - ligar e, em seguida, desligar a mesma luz: os dois se anulam.
+
+    O undo desfaz os comandos restantes na ordem inversa, então um único
+    undo (ou global_undo) reverte o lote inteiro.
+    """
+
+    def __init__(self, commands: Sequence[ICommand]) -> None:
+        self.commands = self.coalesce(commands)
+
+    @staticmethod
+    def coalesce(commands: Sequence[ICommand]) -> List[ICommand]:
+        reduced: List[Optional[ICommand]] = []
+        # id da luz -> posição (em reduced) do último comando para ela
+        last_for_light: Dict[int, int] = {}
+
+        for command in commands:
+            light = getattr(command, 'light', None)
+
+            if light is None:
+                # Não sabemos o que o comando faz: nada é mesclado
+                # por cima dele
+                last_for_light.clear()
+                reduced.append(command)
+                continue
+
+            index = last_for_light.get(id(light), -1)
+            previous = reduced[index] if index >= 0 else None
+
+            if isinstance(command, LightChangeColor) and \
+                    isinstance(previous, LightChangeColor):
+                reduced[index] = None
+
+            elif isinstance(command, LightOffCommand) and \
+                    isinstance(previous, LightOnCommand):
+                reduced[index] = None
+                del last_for_light[id(light)]
+                continue
+
+            last_for_light[id(light)] = len(reduced)
+            reduced.append(command)
+
+        return [command for command in reduced if command is not None]
+
+    def execute(self) -> None:
+        for command in self.commands:
+            command.execute()
+
+    def undo(self) -> None:
+        for command in reversed(self.commands):
+            command.undo()
+
+
+def touched_lights(command: ICommand) -> List[Light]:
+    """ Luzes de um comando (ou dos comandos de um MacroCommand) """
+    light = getattr(command, 'light', None)
+    if light is not None:
+        return [light]
+
+    lights: List[Light] = []
+    for sub_command in getattr(command, 'commands', ()):
+        lights.extend(touched_lights(sub_command))
+    return lights
+
+
+_POINTER_SIZE = calcsize('P')
+
+
+class UndoHistory:
+    """
+    Histórico de undo em um buffer circular.
+
+    Com capacity, guarda no máximo capacity entradas; com byte_budget,
+    guarda no máximo byte_budget bytes. Quando um dos limites é atingido,
+    as entradas mais antigas são descartadas. Inserir e remover do fim são
+    O(1).
+
+    Os nomes das entradas são internados (sys.intern): todas as entradas
+    do mesmo botão compartilham as mesmas strings. Uma entrada custa só a
+    tupla e a sua posição no deque, e é isso que bytes conta.
+    """
+
+    def __init__(self, capacity: Optional[int] = None,
+                 byte_budget: Optional[int] = None) -> None:
+        if capacity is not None and capacity < 1:
+            raise ValueError('capacity deve ser maior que zero')
+
+        self.capacity = capacity
+        self.byte_budget = byte_budget
+        self.evicted = 0
+        self._bytes = 0
+        self._entries: Deque[Tuple[str, str]] = deque(maxlen=capacity)
+
+    def append(self, entry: Tuple[str, str]) -> None:
+        if len(self._entries) == self.capacity:
+            self._evict_oldest()
+
+        name, action = entry
+        entry = (intern(name), intern(action))
+        self._entries.append(entry)
+        self._bytes += self._entry_size(entry)
+
+        if self.byte_budget is not None:
+            while self._bytes > self.byte_budget and len(self._entries) > 1:
+                self._evict_oldest()
+
+    def pop(self) -> Tuple[str, str]:
+        entry = self._entries.pop()
+        self._bytes -= self._entry_size(entry)
+        return entry
+
+    def _evict_oldest(self) -> None:
+        self._bytes -= self._entry_size(self._entries.popleft())
+        self.evicted += 1
+
+    @staticmethod
+    def _entry_size(entry: Tuple[str, str]) -> int:
+        # A tupla mais o ponteiro que o deque guarda para ela
+        return getsizeof(entry) + _POINTER_SIZE
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        return {
+            'entries': len(self._entries),
+            'capacity': self.capacity,
+            'bytes': self._bytes,
+            'byte_budget': self.byte_budget,
+            'evicted': self.evicted,
+        }
+
+    def __getitem__(self, index: int) -> Tuple[str, str]:
+        return self._entries[index]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class RemoteController:
     """ Invoker """
 
-    def __init__(self) -> None:
+    def __init__(self, history_capacity: Optional[int] = None,
+                 history_bytes: Optional[int] = None) -> None:
         self._buttons: Dict[str, ICommand] = {}
-        self._undos: List[Tuple[str, str]] = []
+        self._undos = UndoHistory(history_capacity, history_bytes)
 
     def button_add_command(self, name: str, command: ICommand) -> None:
         self._buttons[name] = command
@@ -106,6 +267,9 @@ class RemoteController:
 
         self._undos.pop()
 
+    def history_stats(self) -> Dict[str, Optional[int]]:
+        return self._undos.stats()
+
 
 if __name__ == "__main__":
     bedroom_light = Light('Luz do quarto', 'Quarto')
@@ -116,7 +280,7 @@ if __name__ == "__main__":
     bedroom_light_blue = LightChangeColor(bedroom_light, 'Blue')
     bedroom_light_red = LightChangeColor(bedroom_light, 'Red')
 
-    remote = RemoteController()
+    remote = RemoteController(history_capacity=5)
 
     remote.button_add_command('first_button', bedroom_light_on)
     remote.button_add_command('second_button', bathroom_light_on)
@@ -135,6 +299,20 @@ if __name__ == "__main__":
     remote.button_pressed('fourth_button')
     remote.button_undo('fourth_button')
 
+    print()
+    print(remote.history_stats())
+
+    print()
+    scene = MacroCommand([
+        LightOnCommand(bathroom_light),
+        LightChangeColor(bedroom_light, 'Green'),
+        LightChangeColor(bedroom_light, 'Yellow'),
+        LightOffCommand(bathroom_light),
+        LightChangeColor(bedroom_light, 'Purple'),
+    ])
+    remote.button_add_command('scene_button', scene)
+    remote.button_pressed('scene_button')
+
     print()
     remote.global_undo()
     remote.global_undo()
@@ -0,0 +1,233 @@
+"""
+Undo/redo para qualquer posição do histórico.
+
+O global_undo do RemoteController volta um passo por vez: voltar 100 mil
+passos significa 100 mil chamadas a undo(), cada uma falando com a luz.
+
+O CheckpointedRemoteController guarda uma linha do tempo com, para cada
+ação, o estado resultante das luzes tocadas (nome, cor, ligada). A cada
+checkpoint_every ações ele também guarda um checkpoint com o estado de
+todas as luzes. Uma luz registrada depois entra nos checkpoints anteriores
+com o estado que tinha antes da primeira ação.
+
+Para ir até uma posição qualquer (undo_to), o controle parte do checkpoint
+mais próximo antes dela (ou da posição atual, se estiver mais perto), aplica
+no máximo checkpoint_every estados da linha do tempo em memória e só então
+atualiza cada luz que mudou, uma única vez.
+
+Apertar um botão depois de desfazer descarta o que podia ser refeito.
+
+Como o histórico do RemoteController, a linha do tempo pode ser limitada
+por history_capacity (ações) e history_bytes (bytes estimados). As ações
+mais antigas são descartadas em blocos, do checkpoint mais antigo até o
+seguinte, para que a posição mais antiga que ainda pode ser alcançada
+sempre tenha um checkpoint. Por isso o limite pode ser ultrapassado em até
+checkpoint_every ações.
+"""
+from __future__ import annotations
+from bisect import bisect_right, insort
+from struct import calcsize
+from sys import getsizeof, intern
+from typing import Dict, List, Optional, Tuple
+
+from command_1 import (ICommand, Light, LightChangeColor, LightOnCommand,
+                       RemoteController, touched_lights)
+from command_journal import LightState
+
+States = Dict[str, Tuple[str, bool]]
+Step = Tuple[str, str, Tuple[LightState, ...]]
+
+_POINTER_SIZE = calcsize('P')
+
+
+class CheckpointedRemoteController(RemoteController):
+    """ Invoker com undo/redo para qualquer posição do histórico """
+
+    def __init__(self, checkpoint_every: int = 1000,
+                 history_capacity: Optional[int] = None,
+                 history_bytes: Optional[int] = None) -> None:
+        super().__init__(history_capacity, history_bytes)
+        self.checkpoint_every = checkpoint_every
+        self.history_capacity = history_capacity
+        self.history_bytes = history_bytes
+        self.position = 0
+        self.lights: Dict[str, Light] = {}
+        # _timeline[0] é a ação feita na posição _first
+        self._first = 0
+        self._timeline: List[Step] = []
+        self._bytes = 0
+        self.evicted = 0
+        self._checkpoints: Dict[int, States] = {}
+        self._checkpoint_positions: List[int] = []
+
+    @property
+    def last(self) -> int:
+        """ Posição depois da última ação guardada """
+        return self._first + len(self._timeline)
+
+    def button_add_command(self, name: str, command: ICommand) -> None:
+        super().button_add_command(name, command)
+        for light in touched_lights(command):
+            if light.name not in self.lights:
+                # Checkpoints anteriores ao registro também precisam do
+                # estado da luz: é o estado dela antes de qualquer ação
+                for states in self._checkpoints.values():
+                    states[light.name] = (light.color, light.is_on)
+            self.lights[light.name] = light
+
+    def button_pressed(self, name: str) -> None:
+        self._run(name, 'execute')
+
+    def button_undo(self, name: str) -> None:
+        self._run(name, 'undo')
+
+    def global_undo(self) -> None:
+        if self.position == self._first:
+            print('Nothing to undo')
+            return None
+        self.undo_to(self.position - 1)
+
+    def redo(self) -> None:
+        if self.position == self.last:
+            print('Nothing to redo')
+            return None
+        self.undo_to(self.position + 1)
+
+    def undo_to(self, position: int) -> None:
+        if not self._first <= position <= self.last:
+            raise IndexError(f'Posição {position} fora do histórico')
+
+        index = bisect_right(self._checkpoint_positions, position) - 1
+        checkpoint = self._checkpoint_positions[index] if index >= 0 else 0
+
+        if checkpoint <= self.position <= position:
+            start, states = self.position, self._current_states()
+        else:
+            start, states = checkpoint, dict(self._checkpoints[checkpoint])
+
+        steps = self._timeline[start - self._first:position - self._first]
+        for _, _, light_states in steps:
+            for light_name, color, is_on in light_states:
+                states[light_name] = (color, is_on)
+
+        for light_name, (color, is_on) in states.items():
+            light = self.lights[light_name]
+            if light.color != color:
+                light.change_color(color)
+            if light.is_on != is_on:
+                if is_on:
+                    light.on()
+                else:
+                    light.off()
+
+        self.position = position
+
+    def history_stats(self) -> Dict[str, Optional[int]]:
+        return {
+            'entries': len(self._timeline),
+            'first': self._first,
+            'position': self.position,
+            'checkpoints': len(self._checkpoints),
+            'bytes': self._bytes,
+            'evicted': self.evicted,
+        }
+
+    def _current_states(self) -> States:
+        return {light.name: (light.color, light.is_on)
+                for light in self.lights.values()}
+
+    def _run(self, name: str, action: str) -> None:
+        if name not in self._buttons:
+            return
+
+        # Um novo comando descarta o que podia ser refeito
+        if self.position < self.last:
+            discarded = self._timeline[self.position - self._first:]
+            self._bytes -= sum(map(self._step_size, discarded))
+            del self._timeline[self.position - self._first:]
+            for position in self._checkpoint_positions:
+                if position > self.position:
+                    del self._checkpoints[position]
+            self._checkpoint_positions = [
+                position for position in self._checkpoint_positions
+                if position <= self.position
+            ]
+
+        if self.position % self.checkpoint_every == 0 and \
+                self.position not in self._checkpoints:
+            self._checkpoints[self.position] = self._current_states()
+            insort(self._checkpoint_positions, self.position)
+
+        command = self._buttons[name]
+        getattr(command, action)()
+
+        step = (intern(name), intern(action), tuple(
+            (light.name, light.color, light.is_on)
+            for light in touched_lights(command)
+        ))
+        self._timeline.append(step)
+        self._bytes += self._step_size(step)
+        self.position += 1
+        self._evict()
+
+    @staticmethod
+    def _step_size(step: Step) -> int:
+        # Os nomes são internados e as cores vêm dos comandos: a ação só
+        # guarda as tuplas (e o ponteiro da lista para ela)
+        _, _, light_states = step
+        return (getsizeof(step) + getsizeof(light_states) +
+                sum(map(getsizeof, light_states)) + _POINTER_SIZE)
+
+    def _over_budget(self) -> bool:
+        return (
+            self.history_capacity is not None and
+            len(self._timeline) > self.history_capacity
+        ) or (
+            self.history_bytes is not None and
+            self._bytes > self.history_bytes
+        )
+
+    def _evict(self) -> None:
+        # Descarta do checkpoint mais antigo até o seguinte, sem passar da
+        # posição atual
+        positions = self._checkpoint_positions
+        while self._over_budget() and len(positions) > 1 and \
+                positions[1] <= self.position:
+            first = positions.pop(0)
+            del self._checkpoints[first]
+
+            evicted = self._timeline[:positions[0] - self._first]
+            del self._timeline[:positions[0] - self._first]
+            self._bytes -= sum(map(self._step_size, evicted))
+            self.evicted += len(evicted)
+            self._first = positions[0]
+
+
+if __name__ == "__main__":
+    bedroom_light = Light('Luz do quarto', 'Quarto')
+
+    remote = CheckpointedRemoteController(checkpoint_every=2,
+                                          history_capacity=4)
+    remote.button_add_command('on', LightOnCommand(bedroom_light))
+    remote.button_add_command('blue', LightChangeColor(bedroom_light, 'Blue'))
+    remote.button_add_command('red', LightChangeColor(bedroom_light, 'Red'))
+
+    remote.button_pressed('on')
+    remote.button_pressed('blue')
+    remote.button_pressed('red')
+    remote.button_pressed('blue')
+    remote.button_pressed('red')
+
+    # Com history_capacity=4, as duas ações mais antigas foram descartadas
+    print()
+    remote.undo_to(2)
+    print(remote.history_stats())
+
+    print()
+    remote.redo()
+    remote.undo_to(5)
+    print(remote.history_stats())
+
+    print()
+    remote.undo_to(2)
+    remote.global_undo()
@@ -0,0 +1,265 @@
+"""
+Journal de comandos.
+
+Um dos usos do padrão Command é fazer registro (log) das solicitações. Aqui
+o JournaledRemoteController grava cada comando executado ou desfeito em um
+arquivo binário que só cresce (append-only), para que o estado das luzes
+sobreviva a um reinício.
+
+Cada registro guarda o botão, a ação e o estado resultante de cada luz
+tocada pelo comando: (nome, cor, ligada), serializado com pickle em um
+protocolo fixo (o formato não muda entre versões do Python). Os registros
+ficam em memória e são gravados em grupo (group commit): um único fsync
+quando acumulam group_size registros, ou max_delay segundos depois do
+primeiro registro pendente (um timer grava o fim de uma rajada mesmo que
+nenhum outro comando chegue).
+
+Se o processo cair no meio de uma gravação, o fim do arquivo pode ter um
+registro incompleto. Ao abrir o journal, o arquivo é truncado no último
+registro completo, para que os registros novos não fiquem depois dele.
+
+A cada snapshot_every registros é gravado um snapshot com o estado de todas
+as luzes e a posição do journal naquele momento. A recuperação (replay)
+carrega o snapshot e aplica apenas os registros gravados depois dele,
+alterando os atributos das luzes diretamente, sem executar os comandos.
+"""
+from __future__ import annotations
+import os
+import pickle
+import struct
+from tempfile import TemporaryDirectory
+from threading import Lock, Timer
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from command_1 import (ICommand, Light, LightChangeColor, LightOnCommand,
+                       RemoteController, touched_lights)
+
+LightState = Tuple[str, str, bool]
+Record = Tuple[str, str, Tuple[LightState, ...]]
+Snapshot = Tuple[int, Dict[str, Tuple[str, bool]]]
+
+# Cada registro é precedido pelo tamanho do seu conteúdo
+_HEADER = struct.Struct('<I')
+_PICKLE_PROTOCOL = 4
+
+
+def complete_length(path: str) -> int:
+    """ Tamanho do trecho do log que contém apenas registros completos """
+    file_size = os.path.getsize(path)
+    position = 0
+
+    with open(path, 'rb') as file:
+        while True:
+            header = file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return position
+
+            (size,) = _HEADER.unpack(header)
+            end = position + _HEADER.size + size
+            if end > file_size:
+                return position
+
+            position = end
+            file.seek(position)
+
+
+class CommandJournal:
+    def __init__(self, directory: str, group_size: int = 256,
+                 max_delay: float = 0.05) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.log_path = os.path.join(directory, 'journal.log')
+        self.snapshot_path = os.path.join(directory, 'snapshot.bin')
+        self.group_size = group_size
+        self.max_delay = max_delay
+        self.commits = 0
+
+        if os.path.exists(self.log_path):
+            length = complete_length(self.log_path)
+            if length < os.path.getsize(self.log_path):
+                os.truncate(self.log_path, length)
+
+        self._file = open(self.log_path, 'ab')
+        self._pending: List[bytes] = []
+        self._lock = Lock()
+        self._timer: Optional[Timer] = None
+
+    def append(self, record: Record) -> None:
+        payload = pickle.dumps(record, protocol=_PICKLE_PROTOCOL)
+
+        with self._lock:
+            self._pending.append(_HEADER.pack(len(payload)) + payload)
+
+            if len(self._pending) >= self.group_size:
+                self._commit()
+            elif self._timer is None:
+                self._timer = Timer(self.max_delay, self.commit)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def commit(self) -> None:
+        with self._lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._pending:
+            self._file.write(b''.join(self._pending))
+            self._pending.clear()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.commits += 1
+
+    def write_snapshot(self, states: Dict[str, Tuple[str, bool]]) -> None:
+        with self._lock:
+            self._commit()
+            position = self._file.tell()
+        temp_path = f'{self.snapshot_path}.tmp'
+
+        with open(temp_path, 'wb') as file:
+            file.write(pickle.dumps((position, states),
+                                    protocol=_PICKLE_PROTOCOL))
+            file.flush()
+            os.fsync(file.fileno())
+
+        # Troca atômica: ou vale o snapshot antigo, ou o novo
+        os.replace(temp_path, self.snapshot_path)
+
+    def read_snapshot(self) -> Snapshot:
+        if not os.path.exists(self.snapshot_path):
+            return 0, {}
+
+        with open(self.snapshot_path, 'rb') as file:
+            return pickle.loads(file.read())
+
+    def records(self, offset: int = 0) -> Iterator[Record]:
+        with open(self.log_path, 'rb') as file:
+            file.seek(offset)
+            data = memoryview(file.read())
+
+        position = 0
+        while position + _HEADER.size <= len(data):
+            (size,) = _HEADER.unpack_from(data, position)
+            position += _HEADER.size
+
+            # Registro incompleto: o processo caiu no meio da gravação
+            if position + size > len(data):
+                return
+
+            yield pickle.loads(data[position:position + size])
+            position += size
+
+    def replay(self, lights: Dict[str, Light]) -> int:
+        """ Restaura o estado das luzes e retorna quantos registros leu """
+        offset, states = self.read_snapshot()
+
+        for name, (color, is_on) in states.items():
+            if name in lights:
+                lights[name].color = color
+                lights[name].is_on = is_on
+
+        count = 0
+        for _, _, light_states in self.records(offset):
+            for name, color, is_on in light_states:
+                if name in lights:
+                    lights[name].color = color
+                    lights[name].is_on = is_on
+            count += 1
+
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._commit()
+            self._file.close()
+
+
+class JournaledRemoteController(RemoteController):
+    """ Invoker que grava cada comando no journal """
+
+    def __init__(self, journal: CommandJournal, snapshot_every: int = 10_000,
+                 history_capacity: Optional[int] = None,
+                 history_bytes: Optional[int] = None) -> None:
+        super().__init__(history_capacity, history_bytes)
+        self.journal = journal
+        self.snapshot_every = snapshot_every
+        self.lights: Dict[str, Light] = {}
+        self._since_snapshot = 0
+
+    def button_add_command(self, name: str, command: ICommand) -> None:
+        super().button_add_command(name, command)
+        for light in touched_lights(command):
+            self.lights[light.name] = light
+
+    def button_pressed(self, name: str) -> None:
+        super().button_pressed(name)
+        if name in self._buttons:
+            self._record(name, 'execute')
+
+    def button_undo(self, name: str) -> None:
+        super().button_undo(name)
+        if name in self._buttons:
+            self._record(name, 'undo')
+
+    def global_undo(self) -> None:
+        if not self._undos:
+            super().global_undo()
+            return
+
+        button_name, action = self._undos[-1]
+        super().global_undo()
+        self._record(
+            button_name, 'undo' if action == 'execute' else 'execute'
+        )
+
+    def restore(self) -> int:
+        return self.journal.replay(self.lights)
+
+    def _record(self, name: str, action: str) -> None:
+        lights = touched_lights(self._buttons[name])
+        self.journal.append((
+            name, action,
+            tuple((light.name, light.color, light.is_on) for light in lights)
+        ))
+
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.snapshot_every:
+            self.journal.write_snapshot({
+                light.name: (light.color, light.is_on)
+                for light in self.lights.values()
+            })
+            self._since_snapshot = 0
+
+
+if __name__ == "__main__":
+    with TemporaryDirectory() as directory:
+        bedroom_light = Light('Luz do quarto', 'Quarto')
+
+        remote = JournaledRemoteController(
+            CommandJournal(directory), snapshot_every=2
+        )
+        remote.button_add_command('on', LightOnCommand(bedroom_light))
+        remote.button_add_command(
+            'blue', LightChangeColor(bedroom_light, 'Blue')
+        )
+        remote.button_add_command(
+            'red', LightChangeColor(bedroom_light, 'Red')
+        )
+
+        remote.button_pressed('on')
+        remote.button_pressed('blue')
+        remote.button_pressed('red')
+        remote.global_undo()
+        remote.journal.close()
+
+        # "Reinício": uma luz nova, restaurada a partir do journal
+        print()
+        restored_light = Light('Luz do quarto', 'Quarto')
+        restored = JournaledRemoteController(CommandJournal(directory))
+        restored.button_add_command('on', LightOnCommand(restored_light))
+        print(f'Registros lidos após o snapshot: {restored.restore()}')
+        print(f'{restored_light.name}: {restored_light.color}, '
+              f'ligada={restored_light.is_on}')
+        restored.journal.close()
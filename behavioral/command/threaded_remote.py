@@ -0,0 +1,205 @@
+"""
+Invoker assíncrono.
+
+No RemoteController os comandos são executados na thread de quem apertou o
+botão, então uma luz lenta trava o controle inteiro. O
+ThreadedRemoteController entrega execute/undo para um pool de threads:
+submit_pressed, submit_undo e submit_global_undo devolvem um Future na
+hora (button_pressed, button_undo e global_undo fazem o mesmo sem devolver
+nada).
+
+Cada receiver (luz) tem a sua fila. Um comando entra na fila de todas as
+luzes que ele altera (touched_lights: a luz do comando, ou as luzes dos
+comandos de um MacroCommand) e só roda quando é o primeiro de todas elas.
+Assim comandos que alteram a mesma luz rodam na ordem em que foram
+enviados, um de cada vez, enquanto luzes diferentes rodam em paralelo.
+Comandos sem luz conhecida ganham uma fila só para eles.
+
+O histórico de undo recebe cada entrada quando o comando termina, portanto
+reflete a ordem de conclusão. global_undo desfaz o último comando concluído.
+shutdown (ou o fim do with) espera todos os comandos enviados rodarem.
+"""
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Condition, Lock
+from time import sleep
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from command_1 import (ICommand, Light, LightChangeColor, LightOnCommand,
+                       MacroCommand, RemoteController, touched_lights)
+
+
+class _Task:
+    def __init__(self, func: Callable[[], None], lanes: Tuple[int, ...]
+                 ) -> None:
+        self.func = func
+        self.lanes = lanes
+        self.future: Future[None] = Future()
+        # Filas em que ainda há comandos antes deste
+        self.blocked = 0
+
+
+class ThreadedRemoteController(RemoteController):
+    """ Invoker que executa os comandos em um pool de threads """
+
+    def __init__(self, max_workers: int = 4,
+                 history_capacity: Optional[int] = None,
+                 history_bytes: Optional[int] = None) -> None:
+        super().__init__(history_capacity, history_bytes)
+        self._executor = ThreadPoolExecutor(max_workers)
+        self._lock = Lock()
+        self._lanes: Dict[int, Deque[_Task]] = {}
+        # Avisado quando todas as filas esvaziam
+        self._idle = Condition(self._lock)
+
+    def button_pressed(self, name: str) -> None:
+        self.submit_pressed(name)
+
+    def button_undo(self, name: str) -> None:
+        self.submit_undo(name)
+
+    def global_undo(self) -> None:
+        self.submit_global_undo()
+
+    def submit_pressed(self, name: str) -> Optional[Future[None]]:
+        return self._run(name, 'execute')
+
+    def submit_undo(self, name: str) -> Optional[Future[None]]:
+        return self._run(name, 'undo')
+
+    def submit_global_undo(self) -> Optional[Future[None]]:
+        with self._lock:
+            if not self._undos:
+                print('Nothing to undo')
+                return None
+            button_name, action = self._undos.pop()
+
+        command = self._buttons[button_name]
+        inverse = command.undo if action == 'execute' else command.execute
+        return self._submit(command, inverse)
+
+    def shutdown(self) -> None:
+        # Comandos que esperam na fila de uma luz são enviados ao pool pela
+        # thread do comando anterior; o pool só fecha depois que todos rodaram
+        with self._idle:
+            self._idle.wait_for(lambda: not self._lanes)
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> ThreadedRemoteController:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+
+    def _run(self, name: str, action: str) -> Optional[Future[None]]:
+        if name not in self._buttons:
+            return None
+
+        command = self._buttons[name]
+
+        def task() -> None:
+            getattr(command, action)()
+            with self._lock:
+                self._undos.append((name, action))
+
+        return self._submit(command, task)
+
+    def _submit(self, command: ICommand,
+                func: Callable[[], None]) -> Future[None]:
+        lanes = tuple(dict.fromkeys(
+            id(light) for light in touched_lights(command)
+        )) or (id(command),)
+        task = _Task(func, lanes)
+
+        with self._lock:
+            for lane in lanes:
+                queue = self._lanes.setdefault(lane, deque())
+                if queue:
+                    task.blocked += 1
+                queue.append(task)
+            ready = task.blocked == 0
+
+        if ready:
+            self._executor.submit(self._execute, task)
+
+        return task.future
+
+    def _execute(self, task: _Task) -> None:
+        if task.future.set_running_or_notify_cancel():
+            try:
+                task.future.set_result(task.func())
+            except BaseException as error:
+                task.future.set_exception(error)
+
+        # Libera as filas do comando; quem ficou na frente de todas as
+        # suas filas pode rodar
+        ready: List[_Task] = []
+        with self._lock:
+            for lane in task.lanes:
+                queue = self._lanes[lane]
+                queue.popleft()
+                if not queue:
+                    del self._lanes[lane]
+                    continue
+                head = queue[0]
+                head.blocked -= 1
+                if head.blocked == 0:
+                    ready.append(head)
+            if not self._lanes:
+                self._idle.notify_all()
+
+        for next_task in ready:
+            self._executor.submit(self._execute, next_task)
+
+
+class SlowLight(Light):
+    """ Uma luz que demora para responder """
+
+    def change_color(self, color: str) -> None:
+        sleep(0.5)
+        super().change_color(color)
+
+
+if __name__ == "__main__":
+    bedroom_light = SlowLight('Luz do quarto', 'Quarto')
+    bathroom_light = Light('Luz do banheiro', 'Banheiro')
+
+    with ThreadedRemoteController() as remote:
+        remote.button_add_command(
+            'bedroom_blue', LightChangeColor(bedroom_light, 'Blue')
+        )
+        remote.button_add_command(
+            'bedroom_red', LightChangeColor(bedroom_light, 'Red')
+        )
+        remote.button_add_command(
+            'bathroom_on', LightOnCommand(bathroom_light)
+        )
+
+        # A luz do banheiro não espera pela luz lenta do quarto,
+        # mas Blue e Red chegam ao quarto nesta ordem
+        remote.button_pressed('bedroom_blue')
+        last = remote.submit_pressed('bedroom_red')
+        remote.button_pressed('bathroom_on')
+
+        if last is not None:
+            last.result()
+
+        print()
+        # O MacroCommand entra nas filas das duas luzes: roda depois dos
+        # comandos anteriores de cada uma e antes dos seguintes
+        remote.button_add_command('scene', MacroCommand([
+            LightChangeColor(bedroom_light, 'Green'),
+            LightChangeColor(bathroom_light, 'Yellow'),
+        ]))
+        remote.button_pressed('scene')
+        last = remote.submit_pressed('bedroom_red')
+
+        if last is not None:
+            last.result()
+        print(bedroom_light.color, bathroom_light.color)
+
+        print()
+        undo = remote.submit_global_undo()
+        if undo is not None:
+            undo.result()
@@ -0,0 +1,198 @@
+"""
+Benchmarks das variações do padrão Iterator.
+
+Execute a partir desta pasta:
+    python benchmark.py
+"""
+import os
+import tracemalloc
+from collections import deque
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from timeit import timeit
+from typing import Any, Callable, Tuple
+
+from iterator_1 import MyList
+from iterator_pipeline import Pipeline
+from parallel_iteration import parallel_map
+from spill_storage import SpillingStorage
+from typed_storage import ChunkedArray
+
+
+def measure(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """ Retorna o objeto construído e o pico de memória da construção """
+    tracemalloc.start()
+    result = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak
+
+
+def bench_iteration(size: int = 1_000_000, number: int = 3) -> None:
+    items = list(range(size))
+    custom = MyList()
+    native = MyList(native_iteration=True)
+    for item in items:
+        custom.add(item)
+        native.add(item)
+
+    results = [
+        ('list', timeit(lambda: deque(items, maxlen=0), number=number)),
+        ('MyIterator', timeit(lambda: deque(custom, maxlen=0),
+                              number=number)),
+        ('MyList nativa', timeit(lambda: deque(native, maxlen=0),
+                                 number=number)),
+        ('ReverseIterator', timeit(
+            lambda: deque(custom.reverse_iterator(), maxlen=0),
+            number=number
+        )),
+    ]
+
+    print(f'Iterando {size} itens x {number}')
+    baseline = results[0][1]
+    for name, elapsed in results:
+        print(f'  {name:<16} {elapsed:.4f}s ({elapsed / baseline:.1f}x list)')
+
+
+def bench_typed_storage(size: int = 2_000_000) -> None:
+    def build_list() -> MyList:
+        mylist = MyList()
+        mylist.extend(float(item) for item in range(size))
+        return mylist
+
+    def build_chunked() -> MyList:
+        mylist = MyList(storage=ChunkedArray('d'))
+        mylist.extend(float(item) for item in range(size))
+        return mylist
+
+    boxed, boxed_peak = measure(build_list)
+    packed, packed_peak = measure(build_chunked)
+
+    print(f'{size} floats')
+    print(f'  list:         {boxed_peak / 2**20:8.1f} MiB')
+    print(f'  ChunkedArray: {packed_peak / 2**20:8.1f} MiB '
+          f'({boxed_peak / packed_peak:.1f}x menos)')
+
+    start, stop = size // 4, size // 4 * 3
+    copy_time = timeit(lambda: boxed[start:stop], number=10)
+    view_time = timeit(lambda: packed[start:stop], number=10)
+    print(f'  fatia de {stop - start} itens x 10: cópia {copy_time:.4f}s, '
+          f'view {view_time:.4f}s')
+
+
+def bench_pipeline(size: int = 1_000_000) -> None:
+    mylist = MyList(native_iteration=True)
+    mylist.extend(range(size))
+
+    def eager() -> int:
+        multiples = [item for item in mylist if item % 3 == 0]
+        doubled = [item * 2 for item in multiples]
+        return sum(doubled)
+
+    def lazy() -> int:
+        return sum(
+            Pipeline(mylist).filter(lambda item: item % 3 == 0)
+            .map(lambda item: item * 2)
+        )
+
+    eager_result, eager_peak = measure(eager)
+    lazy_result, lazy_peak = measure(lazy)
+    assert eager_result == lazy_result
+
+    print(f'filter + map + sum sobre {size} itens (pico de memória)')
+    print(f'  list comprehensions: {eager_peak / 1024:10,.1f} KiB')
+    print(f'  Pipeline:            {lazy_peak / 1024:10,.1f} KiB')
+
+
+def bench_batches(size: int = 1_000_000, batch_size: int = 4096) -> None:
+    mylist = MyList(storage=ChunkedArray('d'))
+    mylist.extend(float(item) for item in range(size))
+
+    def one_by_one() -> float:
+        total = 0.0
+        iterator = iter(mylist)
+        for item in iterator:
+            total += item
+        return total
+
+    def batches() -> float:
+        return sum(sum(batch) for batch in mylist.iter_batches(batch_size))
+
+    assert one_by_one() == batches()
+    calls = sum(1 for _ in mylist.iter_batches(batch_size))
+
+    print(f'Somando {size} floats')
+    print(f'  MyIterator:          {timeit(one_by_one, number=1):.4f}s '
+          f'({size} chamadas a __next__)')
+    print(f'  iter_batches({batch_size}): {timeit(batches, number=1):.4f}s '
+          f'({calls} blocos)')
+
+
+def resident_memory() -> int:
+    """ Memória residente atual do processo em bytes (Linux) """
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def bench_spill_storage(size: int = 20_000_000,
+                        segment_items: int = 1 << 20) -> None:
+    if not os.path.exists('/proc/self/statm'):
+        print('bench_spill_storage: precisa de /proc/self/statm (Linux)')
+        return
+
+    with TemporaryDirectory() as directory:
+        with SpillingStorage(directory, 'd', segment_items) as storage:
+            mylist = MyList(storage=storage, native_iteration=True)
+            mylist.extend(map(float, range(size)))
+
+            base = resident_memory()
+            peak = base
+            start = perf_counter()
+            total = 0.0
+            for index, item in enumerate(mylist):
+                total += item
+                if index % segment_items == 0:
+                    peak = max(peak, resident_memory())
+            elapsed = perf_counter() - start
+
+    print(f'Iterando {size} floats ({size * 8 / 2**20:.0f} MiB) em disco')
+    print(f'  {elapsed:.2f}s, memória residente cresceu no máximo '
+          f'{(peak - base) / 2**20:.1f} MiB')
+
+
+def cpu_bound(value: float) -> float:
+    """ Trabalho de CPU por item (precisa estar no módulo para os workers) """
+    total = value
+    for _ in range(200):
+        total = (total * 1.000001) % 1_000_003.0
+    return total
+
+
+def bench_parallel(size: int = 200_000) -> None:
+    mylist = MyList(storage=ChunkedArray('d'))
+    mylist.extend(float(item) for item in range(size))
+
+    start = perf_counter()
+    expected = [cpu_bound(item) for item in mylist]
+    sequential = perf_counter() - start
+
+    cores = os.cpu_count() or 1
+    print(f'cpu_bound sobre {size} floats ({cores} núcleos disponíveis)')
+    print(f'  MyIterator:        {sequential:.2f}s')
+
+    for workers in range(1, cores + 1):
+        start = perf_counter()
+        result = parallel_map(cpu_bound, mylist, workers)
+        elapsed = perf_counter() - start
+        assert result == expected
+        print(f'  parallel_map({workers:2}): {elapsed:.2f}s '
+              f'({sequential / elapsed:.1f}x)')
+
+
+if __name__ == "__main__":
+    bench_iteration()
+    bench_typed_storage()
+    bench_pipeline()
+    bench_batches()
+    bench_spill_storage()
+    bench_parallel()
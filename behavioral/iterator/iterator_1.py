@@ -16,7 +16,7 @@ de acesso e percurso de uma coleção, delegando tais
 tarefas para um objeto iterador.
 """
 from collections.abc import Iterator, Iterable
-from typing import List, Any
+from typing import Any, List, Optional
 
 
 class MyIterator(Iterator):
@@ -60,18 +60,69 @@ class ReverseIterator(Iterator):
 
 
 class MyList(Iterable):
-    def __init__(self) -> None:
-        self._items: List[Any] = []
-        self._my_iterator = MyIterator(self._items)
+    def __init__(self, native_iteration: bool = False,
+                 storage: Optional[Any] = None) -> None:
+        # storage pode ser qualquer sequência com append, extend e
+        # __getitem__ (ex.: ChunkedArray em typed_storage.py)
+        self._items: Any = [] if storage is None else storage
+        # Quando não há percurso personalizado, o iterador nativo da
+        # lista faz o mesmo trabalho em C
+        self.native_iteration = native_iteration
 
     def add(self, value: Any) -> None:
         self._items.append(value)
 
+    def extend(self, values: Iterable[Any]) -> None:
+        self._items.extend(values)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
     def __iter__(self) -> Iterator:
-        return self._my_iterator
+        # Um iterador novo a cada chamada: dois for seguidos (ou
+        # simultâneos) sobre a mesma lista funcionam
+        if self.native_iteration:
+            return iter(self._iteration_items())
+        return MyIterator(self._iteration_items())
 
     def reverse_iterator(self) -> Iterator:
-        return ReverseIterator(self._items)
+        return ReverseIterator(self._iteration_items())
+
+    def _iteration_items(self) -> Any:
+        # Storages com snapshot (ex.: CowStorage em snapshot_storage.py)
+        # entregam uma versão estável para cada iteração
+        if hasattr(self._items, 'snapshot'):
+            return self._items.snapshot()
+        return self._items
+
+    def iter_batches(self, size: int, reverse: bool = False,
+                     numpy: bool = False) -> Iterator:
+        """
+        Percorre a coleção em blocos contíguos de até size itens.
+
+        Se o storage sabe gerar blocos (ex.: ChunkedArray), os blocos são
+        memoryviews (ou arrays NumPy, com numpy=True) sem cópia. Caso
+        contrário, cada bloco é uma lista, fatiada da mesma versão que
+        __iter__ percorreria (o snapshot, em storages com snapshot).
+        """
+        if hasattr(self._items, 'iter_batches'):
+            return self._items.iter_batches(size, reverse, numpy)
+        return self._list_batches(self._iteration_items(), size, reverse)
+
+    @staticmethod
+    def _list_batches(items: Any, size: int, reverse: bool) -> Iterator:
+        length = len(items)
+
+        if not reverse:
+            for start in range(0, length, size):
+                yield items[start:start + size]
+            return
+
+        for stop in range(length, 0, -size):
+            yield items[max(stop - size, 0):stop][::-1]
 
     def __str__(self) -> str:
         return f'{self.__class__.__name__}({self._items})'
@@ -90,5 +141,10 @@ if __name__ == "__main__":
 
     print()
 
+    for value in mylist:
+        print(value)
+
+    print()
+
     for value in mylist.reverse_iterator():
         print(value)
@@ -0,0 +1,99 @@
+"""
+Operadores preguiçosos (lazy) sobre iteradores.
+
+Filtrar ou transformar uma MyList com list comprehension cria uma lista
+nova com todos os itens. Os operadores abaixo são geradores: cada item
+passa pela cadeia de operações um de cada vez, no momento em que é pedido,
+então a memória usada não depende do tamanho da coleção.
+
+Funcionam sobre qualquer iterador (MyIterator, ReverseIterator...). A
+classe Pipeline permite encadear os operadores:
+
+    Pipeline(mylist.reverse_iterator()).filter(par).map(dobro).take(10)
+"""
+from __future__ import annotations
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Tuple
+
+from iterator_1 import MyList
+
+
+def map_items(func: Callable[[Any], Any],
+              items: Iterable[Any]) -> Iterator[Any]:
+    for item in items:
+        yield func(item)
+
+
+def filter_items(predicate: Callable[[Any], bool],
+                 items: Iterable[Any]) -> Iterator[Any]:
+    for item in items:
+        if predicate(item):
+            yield item
+
+
+def take(count: int, items: Iterable[Any]) -> Iterator[Any]:
+    return islice(items, count)
+
+
+def batched(size: int, items: Iterable[Any]) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def window(size: int, items: Iterable[Any]) -> Iterator[Tuple[Any, ...]]:
+    """ Janelas deslizantes: (a, b, c), (b, c, d), ... """
+    current: Deque[Any] = deque(maxlen=size)
+    for item in items:
+        current.append(item)
+        if len(current) == size:
+            yield tuple(current)
+
+
+def chain_items(*iterables: Iterable[Any]) -> Iterator[Any]:
+    for items in iterables:
+        yield from items
+
+
+class Pipeline(Iterator):
+    def __init__(self, items: Iterable[Any]) -> None:
+        self._iterator = iter(items)
+
+    def __next__(self) -> Any:
+        return next(self._iterator)
+
+    def map(self, func: Callable[[Any], Any]) -> Pipeline:
+        return Pipeline(map_items(func, self._iterator))
+
+    def filter(self, predicate: Callable[[Any], bool]) -> Pipeline:
+        return Pipeline(filter_items(predicate, self._iterator))
+
+    def take(self, count: int) -> Pipeline:
+        return Pipeline(take(count, self._iterator))
+
+    def batched(self, size: int) -> Pipeline:
+        return Pipeline(batched(size, self._iterator))
+
+    def window(self, size: int) -> Pipeline:
+        return Pipeline(window(size, self._iterator))
+
+    def chain(self, *iterables: Iterable[Any]) -> Pipeline:
+        return Pipeline(chain_items(self._iterator, *iterables))
+
+
+if __name__ == "__main__":
+    mylist = MyList()
+    for number in range(1, 11):
+        mylist.add(number)
+
+    print(list(
+        Pipeline(mylist).filter(lambda n: n % 2 == 0).map(lambda n: n * 10)
+    ))
+    print(list(Pipeline(mylist.reverse_iterator()).take(3)))
+    print(list(Pipeline(mylist).batched(4)))
+    print(list(Pipeline(mylist).window(3).take(3)))
+    print(list(Pipeline(mylist).take(2).chain(mylist.reverse_iterator())))
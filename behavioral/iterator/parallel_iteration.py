@@ -0,0 +1,142 @@
+"""
+Iteração paralela particionada.
+
+Um único MyIterator percorre a coleção em um só núcleo. Aqui a MyList é
+dividida em N intervalos de índices disjuntos (partition) e cada intervalo
+é processado por um processo de um pool.
+
+Os valores (numéricos, de um único typecode) são copiados uma única vez
+para um bloco de memória compartilhada (multiprocessing.shared_memory).
+Cada worker recebe apenas o nome do bloco e o seu intervalo, e lê os itens
+por uma memoryview sobre a mesma memória, sem receber cópias serializadas
+(pickle) dos itens. Os resultados voltam na ordem dos intervalos.
+
+O typecode vem do storage da MyList (ChunkedArray, SpillingStorage); para
+listas comuns ele é deduzido dos itens ('q' se todos forem inteiros, 'd'
+se houver floats). Um typecode diferente do storage é recusado, para que
+os valores não voltem convertidos (inteiros como floats, por exemplo).
+
+A função passada para parallel_map precisa poder ser importada pelos
+workers (definida no nível do módulo).
+"""
+from __future__ import annotations
+import os
+from array import array
+from itertools import chain
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, List, Optional, Tuple
+
+from iterator_1 import MyList
+from typed_storage import typed_view
+
+Task = Tuple[str, str, int, int, Callable[[Any], Any]]
+
+
+def partition(length: int, parts: int) -> List[range]:
+    """ Divide range(length) em até parts intervalos contíguos """
+    size, extra = divmod(length, parts)
+    ranges = []
+    start = 0
+
+    for part in range(parts):
+        stop = start + size + (1 if part < extra else 0)
+        if stop > start:
+            ranges.append(range(start, stop))
+        start = stop
+
+    return ranges
+
+
+def infer_typecode(mylist: MyList, typecode: Optional[str] = None) -> str:
+    storage_typecode = getattr(mylist._items, 'typecode', None)
+
+    if storage_typecode is not None:
+        if typecode not in (None, storage_typecode):
+            raise ValueError(f'typecode {typecode!r} diferente do storage '
+                             f'({storage_typecode!r})')
+        return storage_typecode
+
+    if typecode is not None:
+        return typecode
+
+    inferred = 'q'
+    for item in mylist._iteration_items():
+        if isinstance(item, float):
+            inferred = 'd'
+        elif not isinstance(item, int):
+            raise TypeError(f'{type(item).__name__} não cabe em memória '
+                            f'compartilhada; use itens numéricos')
+    return inferred
+
+
+def shared_buffer(shared: SharedMemory) -> memoryview:
+    if shared.buf is None:
+        raise ValueError('Memória compartilhada já fechada')
+    return shared.buf
+
+
+def to_shared_memory(mylist: MyList, typecode: str) -> SharedMemory:
+    itemsize = array(typecode).itemsize
+    shared = SharedMemory(create=True, size=max(len(mylist) * itemsize, 1))
+    target = shared_buffer(shared).cast('B')
+    position = 0
+
+    # Copia em blocos: memoryviews do mesmo typecode são copiadas direto,
+    # o resto (listas, outros tipos) é convertido para array antes
+    for batch in mylist.iter_batches(65536):
+        if not (isinstance(batch, memoryview) and batch.format == typecode):
+            batch = array(typecode, batch)
+        data = memoryview(batch).cast('B')
+        target[position:position + len(data)] = data
+        position += len(data)
+
+    target.release()
+    return shared
+
+
+def _process_range(task: Task) -> List[Any]:
+    name, typecode, start, stop, func = task
+    shared = SharedMemory(name=name)
+    view = typed_view(shared_buffer(shared), typecode)
+
+    try:
+        return [func(item) for item in view[start:stop]]
+    finally:
+        view.release()
+        shared.close()
+
+
+def parallel_map(func: Callable[[Any], Any], mylist: MyList,
+                 workers: Optional[int] = None,
+                 typecode: Optional[str] = None) -> List[Any]:
+    workers = workers or os.cpu_count() or 1
+    typecode = infer_typecode(mylist, typecode)
+    shared = to_shared_memory(mylist, typecode)
+
+    try:
+        tasks: List[Task] = [
+            (shared.name, typecode, part.start, part.stop, func)
+            for part in partition(len(mylist), workers)
+        ]
+        with Pool(workers) as pool:
+            return list(chain.from_iterable(pool.map(_process_range, tasks)))
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def square(value: float) -> float:
+    return value * value
+
+
+if __name__ == "__main__":
+    mylist = MyList()
+    mylist.extend(range(10))
+
+    print(partition(len(mylist), 3))
+    print(parallel_map(square, mylist, workers=3))
+
+    floats = MyList()
+    floats.extend(number / 2 for number in range(10))
+    print(parallel_map(square, floats))
@@ -0,0 +1,107 @@
+"""
+Iteradores sobre snapshots (copy-on-write).
+
+MyIterator lê a coleção por índice enquanto ela está viva: se outra thread
+chamar add durante o for, o resultado depende de quando cada item chegou.
+Copiar a lista antes de cada iteração resolve, mas custa O(n) toda vez.
+
+O CowStorage entrega a cada iteração um Snapshot: a lista atual e o
+tamanho dela naquele momento. Como add só acrescenta no final, os itens que
+o snapshot enxerga nunca mudam e nenhum item é copiado. Alterações no meio
+da coleção (__setitem__, remove), que são raras, mudam uma cópia da lista e
+publicam a cópia nova (copy-on-write). Iteradores antigos continuam com a
+lista antiga, que é liberada quando o último deles termina.
+
+Leitores nunca usam lock; um lock apenas serializa os escritores.
+"""
+from threading import Lock, Thread
+from typing import Any, Iterable, List
+
+from iterator_1 import MyList
+
+
+class Snapshot:
+    """ Sequência somente leitura: os primeiros length itens de items """
+
+    def __init__(self, items: List[Any], length: int) -> None:
+        self._items = items
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            # Os limites são os do snapshot, não os da lista atual
+            start, stop, step = index.indices(self._length)
+            if step > 0:
+                return self._items[start:stop:step]
+            # Com passo negativo, stop == -1 significa "antes do início"
+            return [self._items[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('Snapshot index out of range')
+        return self._items[index]
+
+
+class CowStorage:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._items: List[Any] = []
+
+    def snapshot(self) -> Snapshot:
+        items = self._items
+        return Snapshot(items, len(items))
+
+    def append(self, value: Any) -> None:
+        with self._lock:
+            self._items.append(value)
+
+    def extend(self, values: Iterable[Any]) -> None:
+        with self._lock:
+            self._items.extend(values)
+
+    def __setitem__(self, index: int, value: Any) -> None:
+        with self._lock:
+            items = list(self._items)
+            items[index] = value
+            self._items = items
+
+    def remove(self, value: Any) -> None:
+        with self._lock:
+            items = list(self._items)
+            items.remove(value)
+            self._items = items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._items[index]
+
+    def __repr__(self) -> str:
+        return repr(self._items)
+
+
+if __name__ == "__main__":
+    storage = CowStorage()
+    mylist = MyList(storage=storage)
+    mylist.extend(range(100_000))
+
+    def writer() -> None:
+        for number in range(100_000):
+            mylist.add(number)
+
+    thread = Thread(target=writer)
+    iterator = iter(mylist)
+    thread.start()
+
+    # O iterador vê exatamente os itens que existiam quando foi criado
+    print(sum(1 for _ in iterator))
+    thread.join()
+    print(sum(1 for _ in mylist))
+
+    snapshot_iterator = mylist.reverse_iterator()
+    storage[0] = 'alterado'
+    print(next(iter(mylist)), list(snapshot_iterator)[-1])
@@ -0,0 +1,203 @@
+"""
+Armazenamento com despejo em disco (spill) para MyList.
+
+Para coleções maiores que a memória, o SpillingStorage mantém em memória
+apenas a cauda (o segmento que está recebendo itens). Quando a cauda enche,
+ela é gravada em um arquivo na pasta escolhida.
+
+Acesso por índice, MyIterator, ReverseIterator e iter_batches leem os
+segmentos em disco mapeados em memória (mmap) somente para leitura: o
+sistema operacional carrega as páginas sob demanda e pode descartá-las
+quando precisar de memória, então a memória residente fica limitada mesmo
+para coleções de muitos gigabytes. Os segmentos são lidos em ordem, com
+aviso de leitura sequencial quando o sistema suporta, e a iteração libera
+as páginas de cada segmento assim que termina de lê-lo.
+
+Cada mapeamento ocupa um descritor de arquivo (o mmap guarda uma cópia do
+descritor). Para não esbarrar no limite do sistema, no máximo max_mapped
+segmentos ficam mapeados ao mesmo tempo; os menos usados recentemente são
+desmapeados e mapeados de novo quando precisarem ser lidos. Um segmento
+desmapeado enquanto algum bloco de iter_batches ainda aponta para ele só é
+fechado quando o último desses blocos deixa de existir.
+
+Os blocos da cauda são entregues como cópias (array), já que ela continua
+crescendo e não pode ficar presa a uma memoryview.
+
+Assim como o ChunkedArray, guarda apenas valores numéricos de um único tipo
+(typecode do módulo array).
+"""
+from __future__ import annotations
+import mmap
+import os
+from array import array
+from collections import OrderedDict
+from itertools import islice
+from tempfile import TemporaryDirectory
+from typing import Any, Iterable, Iterator, List, Tuple
+
+from iterator_1 import MyList
+from typed_storage import typed_view
+
+
+class SpillingStorage:
+    def __init__(self, directory: str, typecode: str = 'd',
+                 segment_items: int = 1 << 22, max_mapped: int = 256) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.typecode = typecode
+        self.segment_items = segment_items
+        self.max_mapped = max_mapped
+        self._tail = array(typecode)
+        self._segments: List[str] = []
+        self._mapped: OrderedDict[int, Tuple[mmap.mmap, memoryview]] = \
+            OrderedDict()
+
+    def append(self, value: Any) -> None:
+        self._tail.append(value)
+        if len(self._tail) == self.segment_items:
+            self._spill()
+
+    def extend(self, values: Iterable[Any]) -> None:
+        iterator = iter(values)
+        while True:
+            room = self.segment_items - len(self._tail)
+            before = len(self._tail)
+            self._tail.extend(islice(iterator, room))
+
+            if len(self._tail) == self.segment_items:
+                self._spill()
+            elif len(self._tail) - before < room:
+                return
+
+    def _spill(self) -> None:
+        path = os.path.join(
+            self.directory, f'segment_{len(self._segments):06d}.bin'
+        )
+        with open(path, 'wb') as file:
+            file.write(self._tail)
+
+        self._segments.append(path)
+        self._tail = array(self.typecode)
+
+    def _mapping(self, segment: int) -> Tuple[mmap.mmap, memoryview]:
+        mapping = self._mapped.get(segment)
+        if mapping is not None:
+            self._mapped.move_to_end(segment)
+            return mapping
+
+        with open(self._segments[segment], 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mapped, 'madvise'):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+
+        mapping = (mapped, typed_view(mapped, self.typecode))
+        self._mapped[segment] = mapping
+        while len(self._mapped) > self.max_mapped:
+            self._unmap(*self._mapped.popitem(last=False)[1])
+        return mapping
+
+    @staticmethod
+    def _unmap(mapped: mmap.mmap, view: memoryview) -> None:
+        view.release()
+        try:
+            mapped.close()
+        except BufferError:
+            # Ainda há blocos usando o segmento: o mmap é fechado quando
+            # o último deles for liberado
+            pass
+
+    def __len__(self) -> int:
+        return len(self._segments) * self.segment_items + len(self._tail)
+
+    def __getitem__(self, index: int) -> Any:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('SpillingStorage index out of range')
+
+        segment, offset = divmod(index, self.segment_items)
+        if segment < len(self._segments):
+            return self._mapping(segment)[1][offset]
+        return self._tail[offset]
+
+    def __iter__(self) -> Iterator[Any]:
+        for segment in range(len(self._segments)):
+            mapped, view = self._mapping(segment)
+            # Cópia da view: o segmento pode ser desmapeado (e a view
+            # original liberada) enquanto este gerador está parado
+            yield from memoryview(view)
+            # Segmento lido: as páginas podem sair da memória residente
+            # (serão lidas do arquivo de novo se alguém precisar)
+            if hasattr(mmap, 'MADV_DONTNEED') and not mapped.closed:
+                mapped.madvise(mmap.MADV_DONTNEED)
+        yield from self._tail
+
+    def iter_batches(self, size: int, reverse: bool = False,
+                     numpy: bool = False) -> Iterator[Any]:
+        """
+        Blocos de até size itens, sem atravessar segmentos: memoryviews
+        para os segmentos em disco, cópias (array) para a cauda
+        """
+        def segment_batches(segment: int) -> Iterator[memoryview]:
+            view = memoryview(self._mapping(segment)[1])
+            if reverse:
+                for stop in range(len(view), 0, -size):
+                    yield view[max(stop - size, 0):stop][::-1]
+                return
+            for start in range(0, len(view), size):
+                yield view[start:start + size]
+
+        def tail_batches() -> Iterator[array]:
+            tail = self._tail
+            if reverse:
+                for stop in range(len(tail), 0, -size):
+                    yield tail[max(stop - size, 0):stop][::-1]
+                return
+            for start in range(0, len(tail), size):
+                yield tail[start:start + size]
+
+        def batches() -> Iterator[Any]:
+            segments = range(len(self._segments))
+            if reverse:
+                yield from tail_batches()
+                for segment in reversed(segments):
+                    yield from segment_batches(segment)
+                return
+
+            for segment in segments:
+                yield from segment_batches(segment)
+            yield from tail_batches()
+
+        if numpy:
+            import numpy as np  # type: ignore[import-not-found]
+            return map(np.asarray, batches())
+        return batches()
+
+    def close(self) -> None:
+        while self._mapped:
+            self._unmap(*self._mapped.popitem()[1])
+
+    def __enter__(self) -> SpillingStorage:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}({len(self._segments)} segmentos '
+                f'em disco, {len(self._tail)} itens em memória)')
+
+
+if __name__ == "__main__":
+    with TemporaryDirectory() as directory:
+        with SpillingStorage(directory, 'i', segment_items=4) as storage:
+            mylist = MyList(storage=storage)
+            mylist.extend(range(1, 11))
+            mylist.add(11)
+
+            print(mylist)
+            print(list(mylist))
+            print(list(mylist.reverse_iterator()))
+            print(mylist[5], mylist[-1])
+            print([batch.tolist() for batch in mylist.iter_batches(3)])
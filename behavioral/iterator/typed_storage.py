@@ -0,0 +1,230 @@
+"""
+Armazenamento tipado para MyList.
+
+Uma lista Python guarda referências para objetos (cada número é um objeto
+inteiro em memória, mais a referência na lista). O ChunkedArray guarda os
+valores empacotados em blocos de array.array de tamanho fixo, todos do mesmo
+tipo (typecode): um float ocupa 8 bytes em vez de cerca de 32.
+
+- Cada bloco é alocado com chunk_size posições e nunca muda de tamanho,
+  então views (memoryview) sobre ele continuam válidas enquanto a coleção
+  cresce;
+- extend aceita iteráveis (convertidos em blocos pelo próprio array) e
+  buffers (bytes, bytearray, memoryview, array do mesmo typecode), copiados
+  direto para os blocos;
+- fatias e view(start, stop) retornam um ChunkedView com memoryviews dos
+  blocos, sem copiar os valores.
+
+Como __getitem__ aceita índices negativos e levanta IndexError fora dos
+limites, MyIterator e ReverseIterator funcionam sem nenhuma mudança.
+"""
+from array import array
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator, List, Optional, Union
+
+from iterator_1 import MyList
+
+
+def typed_view(buffer: Any, typecode: str) -> memoryview:
+    """ memoryview de buffer com os itens do typecode (módulo array) """
+    # O typecode só é conhecido em tempo de execução
+    return memoryview(buffer).cast(typecode)  # type: ignore[call-overload]
+
+
+class ChunkedView:
+    """ Visão somente leitura de um trecho do ChunkedArray """
+
+    def __init__(self, segments: List[memoryview]) -> None:
+        self.segments = segments
+        self._length = sum(len(segment) for segment in segments)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self.segments)
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += self._length
+
+        for segment in self.segments:
+            if 0 <= index < len(segment):
+                return segment[index]
+            index -= len(segment)
+
+        raise IndexError('ChunkedView index out of range')
+
+    @property
+    def nbytes(self) -> int:
+        return sum(segment.nbytes for segment in self.segments)
+
+    def tolist(self) -> List[Any]:
+        return list(self)
+
+
+class ChunkedArray:
+    def __init__(self, typecode: str = 'd', chunk_size: int = 65536) -> None:
+        self.typecode = typecode
+        self.chunk_size = chunk_size
+        self.itemsize = array(typecode).itemsize
+        self._chunks: List[array] = []
+        self._length = 0
+
+    def append(self, value: Any) -> None:
+        chunk_index, offset = divmod(self._length, self.chunk_size)
+        if chunk_index == len(self._chunks):
+            self._new_chunk()
+
+        self._chunks[chunk_index][offset] = value
+        self._length += 1
+
+    def extend(self, values: Union[Iterable[Any], bytes, memoryview]) -> None:
+        if isinstance(values, (bytes, bytearray, memoryview)) or (
+            isinstance(values, array) and values.typecode == self.typecode
+        ):
+            self._extend_buffer(memoryview(values).cast('B'))
+            return
+
+        iterator = iter(values)
+        while True:
+            chunk_index, offset = divmod(self._length, self.chunk_size)
+            block = array(
+                self.typecode, islice(iterator, self.chunk_size - offset)
+            )
+            if not block:
+                return
+
+            if chunk_index == len(self._chunks):
+                self._new_chunk()
+
+            self._chunks[chunk_index][offset:offset + len(block)] = block
+            self._length += len(block)
+
+    def view(self, start: int = 0,
+             stop: Optional[int] = None) -> ChunkedView:
+        start, stop, _ = slice(start, stop).indices(self._length)
+
+        segments: List[memoryview] = []
+        while start < stop:
+            chunk_index, offset = divmod(start, self.chunk_size)
+            end = min(self.chunk_size, offset + stop - start)
+            segments.append(memoryview(self._chunks[chunk_index])[offset:end])
+            start += end - offset
+
+        return ChunkedView(segments)
+
+    def iter_range(self, start: int, stop: int) -> Iterator[Any]:
+        return iter(self.view(start, stop))
+
+    def iter_batches(self, size: int, reverse: bool = False,
+                     numpy: bool = False) -> Iterator[Any]:
+        """
+        Blocos de até size itens como memoryviews dos próprios blocos de
+        armazenamento (ou arrays NumPy sobre a mesma memória). Um bloco
+        nunca atravessa o limite entre dois chunks, então pode vir menor.
+        """
+        if numpy:
+            import numpy as np  # type: ignore[import-not-found]
+            return map(np.asarray, self._batches(size, reverse))
+        return self._batches(size, reverse)
+
+    def _batches(self, size: int, reverse: bool) -> Iterator[memoryview]:
+        if not reverse:
+            start = 0
+            while start < self._length:
+                chunk_index, offset = divmod(start, self.chunk_size)
+                end = min(offset + size, self.chunk_size,
+                          offset + self._length - start)
+                yield memoryview(self._chunks[chunk_index])[offset:end]
+                start += end - offset
+            return
+
+        stop = self._length
+        while stop > 0:
+            chunk_index, end = divmod(stop - 1, self.chunk_size)
+            offset = max(end + 1 - size, 0)
+            yield memoryview(self._chunks[chunk_index])[offset:end + 1][::-1]
+            stop -= end + 1 - offset
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._chunks) * self.chunk_size * self.itemsize
+
+    def _new_chunk(self) -> None:
+        self._chunks.append(
+            array(self.typecode, bytes(self.chunk_size * self.itemsize))
+        )
+
+    def _extend_buffer(self, data: memoryview) -> None:
+        if len(data) % self.itemsize:
+            raise ValueError('Buffer size is not a multiple of item size')
+
+        position = 0
+        while position < len(data):
+            chunk_index, offset = divmod(self._length, self.chunk_size)
+            room = (self.chunk_size - offset) * self.itemsize
+            piece = data[position:position + room]
+
+            if chunk_index == len(self._chunks):
+                self._new_chunk()
+
+            start = offset * self.itemsize
+            chunk = memoryview(self._chunks[chunk_index]).cast('B')
+            chunk[start:start + len(piece)] = piece
+
+            self._length += len(piece) // self.itemsize
+            position += len(piece)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.view())
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                # Passos diferentes de 1 não são contíguos: aqui há cópia
+                return [self[position]
+                        for position in range(*index.indices(self._length))]
+            start, stop, _ = index.indices(self._length)
+            return self.view(start, stop)
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('ChunkedArray index out of range')
+
+        chunk_index, offset = divmod(index, self.chunk_size)
+        return self._chunks[chunk_index][offset]
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}({self.typecode!r}, '
+                f'{len(self)} itens)')
+
+
+if __name__ == "__main__":
+    storage = ChunkedArray('i', chunk_size=4)
+    mylist = MyList(storage=storage)
+
+    mylist.add(1)
+    mylist.add(2)
+    mylist.extend(range(3, 11))
+    mylist.extend(array('i', [11, 12]))
+
+    print(mylist)
+
+    for value in mylist:
+        print(value, end=' ')
+    print()
+
+    for value in mylist.reverse_iterator():
+        print(value, end=' ')
+    print()
+
+    view = mylist[2:9]
+    print(len(view.segments), 'segmentos:', view.tolist())
+
+    print([batch.tolist() for batch in mylist.iter_batches(3)])
+    print([batch.tolist() for batch in mylist.iter_batches(3, reverse=True)])
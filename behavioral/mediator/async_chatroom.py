@@ -0,0 +1,322 @@
+"""
+Chatroom assíncrono com entrega real das mensagens (fan-out).
+
+Cada AsyncPerson tem uma caixa de entrada (inbox) limitada, esvaziada por
+uma tarefa própria do asyncio. O broadcast só coloca a mensagem (formatada
+uma vez) nas caixas dos outros colleagues e segue em frente: quem lê devagar
+acumula mensagens na própria caixa sem atrasar os outros.
+
+Quando a caixa de alguém enche, a política do chatroom decide:
+- BLOCK: quem envia espera abrir espaço na caixa cheia (os outros já
+  receberam a mensagem); se o colleague sair do chat, a espera termina;
+- DROP_OLDEST: a mensagem mais antiga da caixa é descartada;
+- DISCONNECT: o colleague lento é removido do chatroom.
+
+A tarefa de cada colleague trata todas as mensagens que já estão na caixa
+antes de voltar a esperar, então uma rajada de mensagens custa um único
+despertar por colleague.
+"""
+from __future__ import annotations
+import asyncio
+from abc import ABC, abstractmethod
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, List, MutableSequence, Optional
+
+
+class SlowConsumerPolicy(Enum):
+    BLOCK = 'block'
+    DROP_OLDEST = 'drop_oldest'
+    DISCONNECT = 'disconnect'
+
+
+class Inbox:
+    """
+    Fila limitada com a mesma interface básica de asyncio.Queue (put,
+    put_nowait, get, get_nowait, join), mais leve: sem contagem de tarefas
+    e acordando o leitor só quando ele está esperando.
+
+    Uma caixa fechada (close) descarta o que recebe e libera quem está
+    esperando nela: quem envia (put) e quem espera esvaziar (join).
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.closed = False
+        self._items: Deque[Any] = deque()
+        self._getter: Optional[asyncio.Future] = None
+        self._putters: Deque[asyncio.Future] = deque()
+        self._joiners: List[asyncio.Future] = []
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+
+    def open(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+        self._items.clear()
+        _wake_all(self._putters)
+        _wake_all(self._joiners)
+
+    def put_nowait(self, item: Any) -> None:
+        if self.closed:
+            return
+        if len(self._items) >= self.maxsize:
+            raise asyncio.QueueFull
+        self._items.append(item)
+
+        getter = self._getter
+        if getter is not None:
+            self._getter = None
+            if not getter.done():
+                getter.set_result(None)
+
+    async def put(self, item: Any) -> None:
+        while not self.closed and len(self._items) >= self.maxsize:
+            putter = asyncio.get_running_loop().create_future()
+            self._putters.append(putter)
+            await putter
+        self.put_nowait(item)
+
+    def get_nowait(self) -> Any:
+        if not self._items:
+            raise asyncio.QueueEmpty
+        item = self._items.popleft()
+
+        while self._putters:
+            putter = self._putters.popleft()
+            if not putter.done():
+                putter.set_result(None)
+                break
+
+        if not self._items:
+            _wake_all(self._joiners)
+        return item
+
+    async def get(self) -> Any:
+        while not self._items:
+            self._getter = asyncio.get_running_loop().create_future()
+            await self._getter
+        return self.get_nowait()
+
+    async def join(self) -> None:
+        """ Espera a caixa esvaziar (ou ser fechada) """
+        while self._items:
+            joiner = asyncio.get_running_loop().create_future()
+            self._joiners.append(joiner)
+            await joiner
+
+
+def _wake_all(waiters: MutableSequence[asyncio.Future]) -> None:
+    for waiter in waiters:
+        if not waiter.done():
+            waiter.set_result(None)
+    waiters.clear()
+
+
+class AsyncColleague(ABC):
+    def __init__(self):
+        self.name: str
+        self.inbox: Inbox
+
+    @abstractmethod
+    async def broadcast(self, msg: str) -> None: pass
+
+    @abstractmethod
+    def receive(self, msg: Any) -> None: pass
+
+
+class AsyncPerson(AsyncColleague):
+    def __init__(self, name: str, mediator: AsyncMediator,
+                 inbox_size: int = 1024) -> None:
+        self.name = name
+        self.mediator = mediator
+        self.inbox = Inbox(inbox_size)
+        self.dropped = 0
+        self._consumer: Optional[asyncio.Task] = None
+
+    async def broadcast(self, msg: str) -> None:
+        await self.mediator.broadcast(self, msg)
+
+    async def send_direct(self, receiver: str, msg: str) -> None:
+        await self.mediator.direct(self, receiver, msg)
+
+    def receive(self, msg: Any) -> None:
+        # Payloads já codificados (PayloadChatroom) chegam como bytes
+        if isinstance(msg, (bytes, bytearray, memoryview)):
+            msg = str(msg, 'utf-8').rstrip('\n')
+        print(f'[{self.name}] {msg}')
+
+    def start(self) -> None:
+        if self._consumer is None:
+            self.inbox.open()
+            self._consumer = asyncio.ensure_future(self._consume())
+            self._consumer.add_done_callback(self._consumer_done)
+
+    def stop(self) -> None:
+        # Fechar a caixa libera quem está bloqueado enviando para ela
+        self.inbox.close()
+        if self._consumer is not None:
+            self._consumer.cancel()
+            self._consumer = None
+
+    def _consumer_done(self, consumer: asyncio.Task) -> None:
+        # Se a tarefa morreu com erro (ex.: BrokenPipeError no print), a
+        # caixa é fechada para não bloquear quem envia para ela
+        if consumer is self._consumer:
+            self._consumer = None
+            self.inbox.close()
+
+    async def _consume(self) -> None:
+        inbox = self.inbox
+        while True:
+            self.receive(await inbox.get())
+            while not inbox.empty():
+                self.receive(inbox.get_nowait())
+
+    async def join(self) -> None:
+        """ Espera a caixa de entrada esvaziar """
+        await self.inbox.join()
+
+
+class AsyncMediator(ABC):
+    @abstractmethod
+    async def broadcast(self, colleague: AsyncColleague, msg: str) -> None:
+        pass
+
+    @abstractmethod
+    async def direct(self, sender: AsyncColleague, receiver: str,
+                     msg: str) -> None: pass
+
+
+class AsyncChatroom(AsyncMediator):
+    def __init__(self, policy: SlowConsumerPolicy = SlowConsumerPolicy.BLOCK
+                 ) -> None:
+        self.policy = policy
+        # Mesmo registro do Chatroom: dicts como conjuntos ordenados por
+        # identidade e um índice por nome (o primeiro adicionado recebe)
+        self.colleagues: Dict[AsyncPerson, None] = {}
+        self._by_name: Dict[str, Dict[AsyncPerson, None]] = {}
+
+    def is_colleague(self, colleague: AsyncColleague) -> bool:
+        return colleague in self.colleagues
+
+    def add(self, colleague: AsyncPerson) -> None:
+        if not self.is_colleague(colleague):
+            self.colleagues[colleague] = None
+            self._by_name.setdefault(colleague.name, {})[colleague] = None
+            colleague.start()
+
+    def remove(self, colleague: AsyncPerson) -> None:
+        if self.is_colleague(colleague):
+            del self.colleagues[colleague]
+            same_name = self._by_name[colleague.name]
+            del same_name[colleague]
+            if not same_name:
+                del self._by_name[colleague.name]
+            colleague.stop()
+
+    def find(self, name: str) -> Optional[AsyncPerson]:
+        same_name = self._by_name.get(name)
+        return next(iter(same_name)) if same_name else None
+
+    async def broadcast(self, colleague: AsyncColleague, msg: str) -> None:
+        if not self.is_colleague(colleague):
+            return
+
+        message = self.format_broadcast(colleague, msg)
+        full: List[AsyncPerson] = []
+
+        for receiver in self.colleagues:
+            if receiver is colleague:
+                continue
+            try:
+                receiver.inbox.put_nowait(message)
+            except asyncio.QueueFull:
+                full.append(receiver)
+
+        for receiver in full:
+            await self._deliver_full(receiver, message)
+
+    async def direct(self, sender: AsyncColleague, receiver: str,
+                     msg: str) -> None:
+        if not self.is_colleague(sender):
+            return
+
+        receiver_obj = self.find(receiver)
+
+        if receiver_obj is None:
+            return
+
+        message = self.format_direct(sender, receiver_obj, msg)
+        try:
+            receiver_obj.inbox.put_nowait(message)
+        except asyncio.QueueFull:
+            await self._deliver_full(receiver_obj, message)
+
+    def format_broadcast(self, colleague: AsyncColleague, msg: str) -> Any:
+        return f'{colleague.name} disse: {msg}'
+
+    def format_direct(self, sender: AsyncColleague, receiver: AsyncColleague,
+                      msg: str) -> Any:
+        return f'{sender.name} para {receiver.name}: {msg}'
+
+    async def _deliver_full(self, receiver: AsyncPerson, message: Any) -> None:
+        if self.policy is SlowConsumerPolicy.BLOCK:
+            await receiver.inbox.put(message)
+        elif self.policy is SlowConsumerPolicy.DROP_OLDEST:
+            receiver.inbox.get_nowait()
+            receiver.inbox.put_nowait(message)
+            receiver.dropped += 1
+        else:
+            self.remove(receiver)
+
+
+class SlowPerson(AsyncPerson):
+    """ Lê uma mensagem a cada delay segundos """
+
+    def __init__(self, name: str, mediator: AsyncMediator,
+                 inbox_size: int = 1024, delay: float = 0.1) -> None:
+        super().__init__(name, mediator, inbox_size)
+        self.delay = delay
+
+    async def _consume(self) -> None:
+        while True:
+            self.receive(await self.inbox.get())
+            await asyncio.sleep(self.delay)
+
+
+async def main() -> None:
+    for policy in SlowConsumerPolicy:
+        print(f'--- {policy.value} ---')
+        chat = AsyncChatroom(policy)
+
+        joao = AsyncPerson('João', chat)
+        maria = AsyncPerson('Maria', chat)
+        elis = SlowPerson('Elis', chat, inbox_size=1, delay=0.05)
+
+        for person in (joao, maria, elis):
+            chat.add(person)
+
+        for number in range(3):
+            await joao.broadcast(f'Mensagem {number}')
+        await maria.send_direct('Elis', 'Oi Elis, tudo bem?')
+
+        await asyncio.sleep(0.2)
+        print('Elis descartou', elis.dropped, 'e está no chat:',
+              chat.is_colleague(elis))
+
+        for person in (joao, maria, elis):
+            chat.remove(person)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
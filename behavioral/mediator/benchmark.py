@@ -0,0 +1,249 @@
+"""
+Benchmarks das variações do padrão Mediator.
+
+Execute a partir desta pasta:
+    python benchmark.py
+"""
+import asyncio
+import os
+import sys
+from time import perf_counter
+from timeit import timeit
+from typing import BinaryIO, List, Tuple
+
+from async_chatroom import (AsyncChatroom, AsyncMediator, AsyncPerson,
+                            SlowConsumerPolicy, SlowPerson)
+from mediator import Chatroom, Colleague, Mediator, Person
+from payload_chatroom import PayloadChatroom, TransportPerson
+from sharded_chatroom import ShardedChatroom
+
+
+class SilentPerson(Person):
+    """ Person que conta as mensagens em vez de imprimir """
+
+    def __init__(self, name: str, mediator: Mediator) -> None:
+        super().__init__(name, mediator)
+        self.received = 0
+
+    def direct(self, msg: str) -> None:
+        self.received += 1
+
+
+class ListChatroom(Chatroom):
+    """ Registro em lista com busca linear (implementação anterior) """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.members: List[Colleague] = []
+
+    def is_colleague(self, colleague: Colleague) -> bool:
+        return colleague in self.members
+
+    def add(self, colleague: Colleague) -> None:
+        if not self.is_colleague(colleague):
+            self.members.append(colleague)
+
+    def direct(self, sender: Colleague, receiver: str, msg: str) -> None:
+        if not self.is_colleague(sender):
+            return
+
+        receiver_obj = [
+            colleague for colleague in self.members
+            if colleague.name == receiver
+        ]
+        if receiver_obj:
+            receiver_obj[0].direct(
+                f'{sender.name} para {receiver_obj[0].name}: {msg}'
+            )
+
+
+def build_room(chat: Chatroom, size: int) -> List[SilentPerson]:
+    people = [SilentPerson(f'Person {index}', chat) for index in range(size)]
+    for person in people:
+        chat.add(person)
+    return people
+
+
+def bench_direct(sizes: Tuple[int, ...] = (100, 1_000, 10_000, 100_000)
+                 ) -> None:
+    print('Latência de send_direct por tamanho da sala (último membro envia '
+          'para o penúltimo)')
+
+    for size in sizes:
+        results = []
+        for chat in (ListChatroom(), Chatroom()):
+            people = build_room(chat, size)
+            sender, receiver = people[-1], people[-2]
+            number = max(100_000 // size, 10)
+
+            elapsed = timeit(
+                lambda: sender.send_direct(receiver.name, 'Olá'),
+                number=number,
+            )
+            assert receiver.received == number
+            results.append(elapsed / number)
+
+        linear, indexed = results
+        print(f'  {size:>7} membros: lista {linear * 1e6:10.2f} µs  '
+              f'índice {indexed * 1e6:6.2f} µs  ({linear / indexed:,.0f}x)')
+
+
+class CountingPerson(AsyncPerson):
+    def __init__(self, name: str, mediator: AsyncMediator,
+                 inbox_size: int = 1024) -> None:
+        super().__init__(name, mediator, inbox_size)
+        self.received = 0
+
+    def receive(self, msg: str) -> None:
+        self.received += 1
+
+
+class QuietSlowPerson(SlowPerson):
+    def receive(self, msg: str) -> None:
+        pass
+
+
+async def async_broadcast(members: int, messages: int,
+                          policy: SlowConsumerPolicy) -> None:
+    chat = AsyncChatroom(policy)
+    people = [CountingPerson(f'Person {index}', chat, inbox_size=256)
+              for index in range(members)]
+    slow = QuietSlowPerson('Slow', chat, inbox_size=16, delay=0.01)
+
+    for person in [*people, slow]:
+        chat.add(person)
+    await asyncio.sleep(0)
+
+    sender = people[0]
+    start = perf_counter()
+    for number in range(messages):
+        await sender.broadcast('Olá')
+        # Deixa os leitores trabalharem de tempos em tempos
+        if number % 64 == 63:
+            await asyncio.sleep(0)
+    for person in people:
+        await person.join()
+    elapsed = perf_counter() - start
+
+    deliveries = sum(person.received for person in people)
+    assert deliveries == (members - 1) * messages
+    print(f'  {policy.value:>11}: {deliveries / elapsed:12,.0f} entregas/s '
+          f'(lento: {slow.dropped} descartadas, no chat: '
+          f'{chat.is_colleague(slow)})')
+
+    for person in [*people, slow]:
+        chat.remove(person)
+
+
+def bench_async_broadcast(members: int = 10_000, messages: int = 200) -> None:
+    print(f'Broadcast assíncrono para {members} membros + 1 leitor lento '
+          f'({messages} mensagens)')
+    for policy in (SlowConsumerPolicy.DROP_OLDEST,
+                   SlowConsumerPolicy.DISCONNECT):
+        asyncio.run(async_broadcast(members, messages, policy))
+
+
+class EncodingPerson(AsyncPerson):
+    """ Escreve cada mensagem (str) no transporte, codificando na entrega """
+
+    def __init__(self, name: str, mediator: AsyncMediator,
+                 writer: BinaryIO, inbox_size: int = 1024) -> None:
+        super().__init__(name, mediator, inbox_size)
+        self.writer = writer
+
+    def receive(self, msg: str) -> None:
+        self.writer.write(f'{msg}\n'.encode())
+
+
+async def deliver_to_transport(chat: AsyncChatroom, members: int,
+                               messages: int, writer: BinaryIO
+                               ) -> Tuple[float, float, int]:
+    """
+    Faz messages broadcasts sem deixar os leitores rodarem (todas as
+    entregas ficam nas caixas de entrada) e depois esvazia as caixas no
+    transporte. Retorna o tempo dos broadcasts, o tempo de escrita e os
+    blocos de memória alocados enquanto as mensagens esperam nas caixas.
+    """
+    person_class = (TransportPerson if isinstance(chat, PayloadChatroom)
+                    else EncodingPerson)
+    people = [person_class(f'Person {index}', chat, writer,
+                           inbox_size=messages)
+              for index in range(members)]
+    for person in people:
+        chat.add(person)
+
+    blocks = sys.getallocatedblocks()
+    start = perf_counter()
+    for number in range(messages):
+        await people[0].broadcast(f'Mensagem {number}')
+    fill_time = perf_counter() - start
+    blocks = sys.getallocatedblocks() - blocks
+
+    start = perf_counter()
+    for person in people:
+        await person.join()
+    drain_time = perf_counter() - start
+
+    for person in people:
+        chat.remove(person)
+    return fill_time, drain_time, blocks
+
+
+def bench_payloads(members: int = 10_000, messages: int = 50) -> None:
+    deliveries = (members - 1) * messages
+    print(f'{messages} broadcasts para {members} membros escritos em um '
+          f'transporte ({deliveries} entregas)')
+
+    with open(os.devnull, 'wb') as writer:
+        for chat_class in (AsyncChatroom, PayloadChatroom):
+            fill_time, drain_time, blocks = asyncio.run(
+                deliver_to_transport(chat_class(), members, messages, writer)
+            )
+            print(f'  {chat_class.__name__:>15}: broadcast {fill_time:.2f}s, '
+                  f'escrita {drain_time:.2f}s, {blocks:>7,} blocos '
+                  f'alocados nas caixas')
+
+
+def bench_sharded(members: int = 10_000, broadcasts: int = 200,
+                  directs: int = 200_000,
+                  shard_counts: Tuple[int, ...] = (1, 2, 4)) -> None:
+    print(f'ShardedChatroom com {members} membros ({os.cpu_count()} núcleos '
+          f'disponíveis)')
+
+    for shards in shard_counts:
+        with ShardedChatroom(shards) as chat:
+            people = [Person(f'Person {index}', chat)
+                      for index in range(members)]
+            for person in people:
+                chat.add(person)
+            # Sem join entre os add e o broadcast: todos devem receber
+            people[0].broadcast('Bem-vindos')
+            chat.join()
+
+            start = perf_counter()
+            for number in range(broadcasts):
+                people[number % members].broadcast('Olá')
+            chat.join()
+            broadcast_time = perf_counter() - start
+
+            start = perf_counter()
+            for number in range(directs):
+                people[number % members].send_direct(
+                    people[(number * 7 + 1) % members].name, 'Oi'
+                )
+            chat.join()
+            direct_time = perf_counter() - start
+
+            _, received = chat.stats()
+            assert received == (broadcasts + 1) * (members - 1) + directs
+
+        print(f'  {shards} shards: broadcast '
+              f'{broadcasts * (members - 1) / broadcast_time:12,.0f} '
+              f'entregas/s, direct {directs / direct_time:10,.0f} msgs/s')
+
+
+if __name__ == "__main__":
+    bench_direct()
+    bench_async_broadcast()
+    bench_payloads()
+    bench_sharded()
@@ -9,7 +9,7 @@ interações independentemente.
 """
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, Optional
 
 
 class Colleague(ABC):
@@ -48,18 +48,33 @@ class Mediator(ABC):
 
 class Chatroom(Mediator):
     def __init__(self) -> None:
-        self.colleagues: List[Colleague] = []
+        # Dicts como conjuntos ordenados: busca, inclusão e remoção em O(1)
+        # mantendo a ordem de entrada. Colleagues são comparados por
+        # identidade (não definem __eq__ nem __hash__).
+        self.colleagues: Dict[Colleague, None] = {}
+        # Índice por nome. Nomes podem se repetir; mensagens diretas vão
+        # para o primeiro colleague adicionado com aquele nome.
+        self._by_name: Dict[str, Dict[Colleague, None]] = {}
 
     def is_colleague(self, colleague: Colleague) -> bool:
         return colleague in self.colleagues
 
     def add(self, colleague: Colleague) -> None:
         if not self.is_colleague(colleague):
-            self.colleagues.append(colleague)
+            self.colleagues[colleague] = None
+            self._by_name.setdefault(colleague.name, {})[colleague] = None
 
     def remove(self, colleague: Colleague) -> None:
         if self.is_colleague(colleague):
-            self.colleagues.remove(colleague)
+            del self.colleagues[colleague]
+            same_name = self._by_name[colleague.name]
+            del same_name[colleague]
+            if not same_name:
+                del self._by_name[colleague.name]
+
+    def find(self, name: str) -> Optional[Colleague]:
+        same_name = self._by_name.get(name)
+        return next(iter(same_name)) if same_name else None
 
     def broadcast(self, colleague: Colleague, msg: str) -> None:
         if not self.is_colleague(colleague):
@@ -81,16 +96,13 @@ class Chatroom(Mediator):
         if not self.is_colleague(sender):
             return
 
-        receiver_obj: List[Colleague] = [
-            colleague for colleague in self.colleagues
-            if colleague.name == receiver
-        ]
+        receiver_obj = self.find(receiver)
 
-        if not receiver_obj:
+        if receiver_obj is None:
             return
 
-        receiver_obj[0].direct(
-            f'{sender.name} para {receiver_obj[0].name}: {msg}'
+        receiver_obj.direct(
+            f'{sender.name} para {receiver_obj.name}: {msg}'
         )
 
 
@@ -0,0 +1,74 @@
+"""
+Payloads codificados uma única vez (encode-once).
+
+Para enviar uma mensagem por um transporte (socket, arquivo, pipe) ela
+precisa virar bytes. O AsyncChatroom formata a mensagem uma vez, mas cada
+destinatário ainda codifica a sua cópia ao escrever: um broadcast para N
+pessoas faz N encodes e N bytes novos.
+
+O PayloadChatroom formata e codifica cada mensagem uma única vez. Todos os
+destinatários recebem a mesma memoryview somente leitura sobre o mesmo
+bytes (imutável), e os transportes escrevem essa memoryview direto, sem
+copiar nem codificar de novo. Colleagues comuns (AsyncPerson) decodificam
+o payload no receive.
+"""
+import asyncio
+import sys
+from typing import BinaryIO
+
+from async_chatroom import (AsyncChatroom, AsyncColleague, AsyncMediator,
+                            AsyncPerson)
+
+
+def encode(message: str) -> memoryview:
+    """ Uma linha UTF-8 imutável, pronta para qualquer transporte """
+    return memoryview(f'{message}\n'.encode())
+
+
+class PayloadChatroom(AsyncChatroom):
+    def format_broadcast(self, colleague: AsyncColleague,
+                         msg: str) -> memoryview:
+        return encode(super().format_broadcast(colleague, msg))
+
+    def format_direct(self, sender: AsyncColleague, receiver: AsyncColleague,
+                      msg: str) -> memoryview:
+        return encode(super().format_direct(sender, receiver, msg))
+
+
+class TransportPerson(AsyncPerson):
+    """ Colleague que repassa cada payload para um transporte (write) """
+
+    def __init__(self, name: str, mediator: AsyncMediator,
+                 writer: BinaryIO, inbox_size: int = 1024) -> None:
+        super().__init__(name, mediator, inbox_size)
+        self.writer = writer
+
+    def receive(self, msg: memoryview) -> None:
+        self.writer.write(msg)
+
+
+async def main() -> None:
+    chat = PayloadChatroom()
+
+    joao = TransportPerson('João', chat, sys.stdout.buffer)
+    maria = TransportPerson('Maria', chat, sys.stdout.buffer)
+    elis = AsyncPerson('Elis', chat)
+
+    for person in (joao, maria, elis):
+        chat.add(person)
+
+    await elis.broadcast('Olá pessoas')
+    await maria.send_direct('João', 'Oi João, tudo bem?')
+    # Colleagues comuns também recebem o payload (decodificado no receive)
+    await joao.send_direct('Elis', 'Oi Elis!')
+
+    for person in (joao, maria, elis):
+        await person.join()
+    sys.stdout.buffer.flush()
+
+    for person in (joao, maria, elis):
+        chat.remove(person)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,265 @@
+"""
+Chatroom dividido em vários processos (shards).
+
+Um Chatroom vive em um único processo Python, então a entrega das mensagens
+fica limitada a um núcleo. O ShardedChatroom divide os colleagues entre
+processos pelo hash do nome: cada shard tem o seu próprio Chatroom com os
+colleagues que caíram nele e faz as entregas locais.
+
+O processo principal confere se o remetente está no chat, formata a
+mensagem uma vez e a coloca na fila dos shards dos destinatários:
+- direct: só o shard do destinatário;
+- broadcast: todos os shards, cada um entrega aos seus colleagues.
+
+É a mesma fila por onde chegam os add e remove daquele shard, então cada
+entrega vê todas as mudanças de membros feitas antes do envio.
+
+As entregas acontecem dentro dos shards: o Colleague passado para add é só
+o identificador do colleague. Cada shard cria o seu colleague com
+colleague_factory(nome, mediator) (uma classe ou função do nível do módulo,
+que os processos conseguem importar) e é o direct desse objeto que recebe
+as mensagens. Colleagues com o mesmo nome continuam distintos; mensagens
+diretas vão para o primeiro adicionado com aquele nome, como no Chatroom.
+
+Os shards recebem os pedidos por filas do multiprocessing. Os pedidos são
+agrupados em lotes (batch_size) para pagar o custo da fila por lote e
+não por mensagem; um lote incompleto é enviado max_delay segundos depois
+do seu primeiro pedido. flush envia os lotes pendentes na hora e join
+espera até que todas as mensagens enviadas tenham sido entregues.
+"""
+from __future__ import annotations
+import os
+import zlib
+from itertools import count
+from multiprocessing import Process, Queue
+from threading import Lock, Timer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mediator import Chatroom, Colleague, Mediator, Person
+
+Command = Tuple[Any, ...]
+ColleagueFactory = Callable[[str, Mediator], Colleague]
+
+
+def shard_of(name: str, shards: int) -> int:
+    # hash() de str muda entre processos; crc32 é estável
+    return zlib.crc32(name.encode()) % shards
+
+
+class ShardMember(Person):
+    """ Colleague padrão dentro do shard: só conta as mensagens """
+
+    def __init__(self, name: str, mediator: Mediator) -> None:
+        super().__init__(name, mediator)
+        self.received = 0
+
+    def direct(self, msg: str) -> None:
+        self.received += 1
+
+
+class Shard:
+    """ Executado dentro do processo de cada shard """
+
+    def __init__(self, index: int, inbox: Queue, results: Queue,
+                 colleague_factory: ColleagueFactory) -> None:
+        self.index = index
+        self.inbox = inbox
+        self.results = results
+        self.colleague_factory = colleague_factory
+        self.room = Chatroom()
+        # Colleagues pelo id dado pelo processo principal
+        self.members: Dict[int, Colleague] = {}
+
+    def run(self) -> None:
+        while True:
+            batch = self.inbox.get()
+            if batch is None:
+                return
+
+            for command in batch:
+                getattr(self, command[0])(*command[1:])
+
+    def add(self, member_id: int, name: str) -> None:
+        member = self.colleague_factory(name, self.room)
+        self.members[member_id] = member
+        self.room.add(member)
+
+    def remove(self, member_id: int) -> None:
+        member = self.members.pop(member_id, None)
+        if member is not None:
+            self.room.remove(member)
+
+    def deliver_all(self, sender_id: int, message: str) -> None:
+        sender = self.members.get(sender_id)
+        for colleague in self.room.colleagues:
+            if colleague is not sender:
+                colleague.direct(message)
+
+    def deliver(self, receiver: str, message: str) -> None:
+        receiver_obj = self.room.find(receiver)
+        if receiver_obj is not None:
+            receiver_obj.direct(message)
+
+    def sync(self) -> None:
+        # A fila é FIFO: tudo o que foi enviado antes já foi entregue
+        self.results.put(('synced', self.index))
+
+    def stats(self) -> None:
+        # Colleagues criados por outras fábricas podem não contar entregas
+        received = sum(
+            getattr(colleague, 'received', 0)
+            for colleague in self.room.colleagues
+        )
+        self.results.put(('stats', len(self.room.colleagues), received))
+
+
+def _run_shard(index: int, inbox: Queue, results: Queue,
+               colleague_factory: ColleagueFactory) -> None:
+    Shard(index, inbox, results, colleague_factory).run()
+
+
+class ShardedChatroom(Mediator):
+    def __init__(self, shards: Optional[int] = None, batch_size: int = 1024,
+                 max_delay: float = 0.01,
+                 colleague_factory: ColleagueFactory = ShardMember) -> None:
+        self.shards = shards or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        # Ids dos colleagues adicionados (comparados por identidade)
+        self._ids: Dict[Colleague, int] = {}
+        self._next_id = count()
+        self._queues: List[Queue] = [Queue() for _ in range(self.shards)]
+        self._results: Queue = Queue()
+        self._pending: List[List[Command]] = [[] for _ in range(self.shards)]
+        self._lock = Lock()
+        self._timer: Optional[Timer] = None
+        self._processes = [
+            Process(target=_run_shard,
+                    args=(index, self._queues[index], self._results,
+                          colleague_factory),
+                    daemon=True)
+            for index in range(self.shards)
+        ]
+        for process in self._processes:
+            process.start()
+
+    def _send(self, shard: int, command: Command) -> None:
+        with self._lock:
+            pending = self._pending[shard]
+            pending.append(command)
+
+            if len(pending) >= self.batch_size:
+                self._queues[shard].put(pending)
+                self._pending[shard] = []
+            elif self._timer is None:
+                # Envia o fim de uma rajada mesmo sem novos pedidos
+                self._timer = Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _send_all(self, command: Command) -> None:
+        for shard in range(self.shards):
+            self._send(shard, command)
+        self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            for shard, pending in enumerate(self._pending):
+                if pending:
+                    self._queues[shard].put(pending)
+                    self._pending[shard] = []
+
+    def is_colleague(self, colleague: Colleague) -> bool:
+        return colleague in self._ids
+
+    def add(self, colleague: Colleague) -> None:
+        if not self.is_colleague(colleague):
+            member_id = self._ids[colleague] = next(self._next_id)
+            self._send(shard_of(colleague.name, self.shards),
+                       ('add', member_id, colleague.name))
+
+    def remove(self, colleague: Colleague) -> None:
+        member_id = self._ids.pop(colleague, None)
+        if member_id is not None:
+            self._send(shard_of(colleague.name, self.shards),
+                       ('remove', member_id))
+
+    def broadcast(self, colleague: Colleague, msg: str) -> None:
+        member_id = self._ids.get(colleague)
+        if member_id is None:
+            return
+
+        message = f'{colleague.name} disse: {msg}'
+        for shard in range(self.shards):
+            self._send(shard, ('deliver_all', member_id, message))
+
+    def direct(self, sender: Colleague, receiver: str, msg: str) -> None:
+        if not self.is_colleague(sender):
+            return
+
+        message = f'{sender.name} para {receiver}: {msg}'
+        self._send(shard_of(receiver, self.shards),
+                   ('deliver', receiver, message))
+
+    def join(self) -> None:
+        """ Espera a entrega de tudo o que já foi enviado """
+        self._send_all(('sync',))
+        for _ in range(self.shards):
+            self._results.get()
+
+    def stats(self) -> Tuple[int, int]:
+        """ (colleagues, mensagens entregues) somando todos os shards """
+        self.join()
+        self._send_all(('stats',))
+        totals = [self._results.get()[1:] for _ in range(self.shards)]
+        return (sum(members for members, _ in totals),
+                sum(received for _, received in totals))
+
+    def close(self) -> None:
+        self.flush()
+        for queue in self._queues:
+            queue.put(None)
+        for process in self._processes:
+            process.join()
+
+    def __enter__(self) -> ShardedChatroom:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class EchoMember(ShardMember):
+    """ Imprime as mensagens recebidas dentro do shard """
+
+    def direct(self, msg: str) -> None:
+        super().direct(msg)
+        print(f'[{self.name}] {msg}', flush=True)
+
+
+if __name__ == "__main__":
+    with ShardedChatroom(shards=2, colleague_factory=EchoMember) as chat:
+        joao = Person('João', chat)
+        maria = Person('Maria', chat)
+        elis = Person('Elis', chat)
+        jose = Person('José', chat)
+
+        chat.add(joao)
+        chat.add(maria)
+        chat.add(elis)
+
+        joao.broadcast('Olá pessoas')
+        jose.broadcast('Eu não fui adicionado ao chat...')
+        chat.join()
+
+        print()
+        joao.send_direct('Maria', 'Oi Maria, tudo bem?')
+        maria.send_direct('João', 'Bem e você?')
+        chat.join()
+
+        print()
+        print('Colleagues e mensagens entregues:', chat.stats())
@@ -0,0 +1,180 @@
+"""
+Saída plugável para os exemplos.
+
+Os métodos dos padrões (Light.on, Smartphone.update, TV.volume,
+Product.print_content, AddressFactory.get_address, Person.direct, as
+transições de estado...) escrevem com print(), que por sua vez escreve em
+sys.stdout. Em um terminal cada linha vira uma escrita no sistema, e sob
+carga é isso que domina o tempo.
+
+Em vez de mudar cada exemplo, o ponto de troca é o próprio sys.stdout: todo
+print() de todos os módulos já passa por ele. Este módulo oferece alguns
+destinos (sinks) e o use_sink, que instala um deles enquanto o bloco with
+estiver ativo:
+
+- BufferedSink: junta as linhas em memória e escreve em blocos grandes;
+- NullSink: descarta tudo;
+- CaptureSink: guarda tudo em memória (útil em testes);
+- AsyncSink: entrega as linhas a uma thread, que escreve em blocos.
+
+Também é possível executar qualquer exemplo com um sink:
+    python sink.py buffered behavioral/command/command_1.py
+"""
+from __future__ import annotations
+import io
+import os
+import runpy
+import sys
+from contextlib import contextmanager
+from queue import SimpleQueue
+from threading import Event, Lock, Thread
+from typing import Iterator, List, Optional, TextIO, Union
+
+
+def original_stdout() -> TextIO:
+    """ O stdout do processo (sys.__stdout__ é None sem console) """
+    return sys.__stdout__ or open(os.devnull, 'w')
+
+
+class Sink(io.TextIOBase):
+    """ Destino de texto compatível com print() """
+
+    def writable(self) -> bool:
+        return True
+
+
+class NullSink(Sink):
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+class CaptureSink(Sink):
+    def __init__(self) -> None:
+        self._chunks: List[str] = []
+
+    def write(self, text: str) -> int:
+        self._chunks.append(text)
+        return len(text)
+
+    def getvalue(self) -> str:
+        return ''.join(self._chunks)
+
+    def lines(self) -> List[str]:
+        return self.getvalue().splitlines()
+
+
+class BufferedSink(Sink):
+    """ Junta até max_chunks escritas antes de gravar no stream """
+
+    def __init__(self, stream: Optional[TextIO] = None,
+                 max_chunks: int = 4096) -> None:
+        self.stream = stream or original_stdout()
+        self.max_chunks = max_chunks
+        self._lock = Lock()
+        self._chunks: List[str] = []
+
+    def write(self, text: str) -> int:
+        # append é atômico; só flush precisa do lock
+        chunks = self._chunks
+        chunks.append(text)
+
+        if len(chunks) >= self.max_chunks:
+            self.flush()
+
+        return len(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            chunks = self._chunks[:]
+            del self._chunks[:len(chunks)]
+
+            if chunks:
+                self.stream.write(''.join(chunks))
+            self.stream.flush()
+
+
+class AsyncSink(Sink):
+    """
+    Quem escreve só enfileira; uma thread junta e grava em blocos. flush
+    espera a thread gravar tudo o que foi enfileirado antes dele.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.stream = stream or original_stdout()
+        self._queue: SimpleQueue[Union[str, Event, None]] = SimpleQueue()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, text: str) -> int:
+        self._queue.put(text)
+        return len(text)
+
+    def flush(self) -> None:
+        # Depois de close a thread já gravou tudo
+        if not self._thread.is_alive():
+            return
+
+        done = Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        if not self.closed:
+            self._queue.put(None)
+            self._thread.join()
+        super().close()
+
+    def _run(self) -> None:
+        while True:
+            chunks: List[str] = []
+            item = self._queue.get()
+
+            while isinstance(item, str):
+                chunks.append(item)
+                if self._queue.empty() or len(chunks) >= 4096:
+                    break
+                item = self._queue.get()
+
+            if chunks:
+                self.stream.write(''.join(chunks))
+                self.stream.flush()
+
+            if isinstance(item, Event):
+                item.set()
+            elif item is None:
+                return
+
+
+@contextmanager
+def use_sink(sink: Sink) -> Iterator[Sink]:
+    """ Faz todo print() escrever em sink enquanto o bloco estiver ativo """
+    previous = sys.stdout
+    sys.stdout = sink
+
+    try:
+        yield sink
+    finally:
+        sys.stdout = previous
+        sink.flush()
+        sink.close()
+
+
+SINKS = {
+    'buffered': BufferedSink,
+    'null': NullSink,
+    'async': AsyncSink,
+}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in SINKS:
+        print(f'Uso: python sink.py [{"|".join(SINKS)}] arquivo.py')
+        sys.exit(1)
+
+    sink_name, script = sys.argv[1], sys.argv[2]
+    sys.argv = sys.argv[2:]
+    # Os exemplos importam módulos da própria pasta
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+
+    with use_sink(SINKS[sink_name]()):
+        runpy.run_path(script, run_name='__main__')
@@ -0,0 +1,102 @@
+"""
+Benchmark dos sinks de saída (sink.py).
+
+Chama métodos de vários exemplos que escrevem com print() e compara a saída
+padrão com buffer por linha (como em um terminal) com cada sink.
+
+Execute a partir da raiz do projeto:
+    python sink_benchmark.py
+"""
+import os
+import sys
+from tempfile import TemporaryFile
+from importlib.util import module_from_spec, spec_from_file_location
+from time import perf_counter
+from types import ModuleType
+from typing import Callable, Dict, List
+
+from sink import (AsyncSink, BufferedSink, CaptureSink, NullSink, Sink,
+                  use_sink)
+
+
+def load(path: str) -> ModuleType:
+    """ Importa um exemplo pelo caminho do arquivo """
+    name = os.path.splitext(os.path.basename(path))[0]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(path)))
+    spec = spec_from_file_location(name, path)
+    assert spec is not None and spec.loader is not None
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_workload() -> List[Callable[[], None]]:
+    command = load('behavioral/command/command_1.py')
+    observer = load('behavioral/observer/observer_1.py')
+    bridge = load('structural/bridge/bridge_1.py')
+    composite = load('structural/composite/composite.py')
+    mediator = load('behavioral/mediator/mediator.py')
+
+    light = command.Light('Luz do quarto', 'Quarto')
+    product = composite.Product('camiseta', 10)
+
+    tv = bridge.TV()
+    tv.power = True
+
+    def set_volume() -> None:
+        tv.volume = 50
+
+    weather = observer.WeatherStation()
+    observer_ = observer.Smartphone('iPhone', weather)
+
+    chat = mediator.Chatroom()
+    person = mediator.Person('João', chat)
+
+    return [light.on, light.off, observer_.update, set_volume,
+            product.print_content, lambda: person.direct('Olá')]
+
+
+def run(workload: List[Callable[[], None]], calls: int) -> None:
+    for _ in range(calls):
+        for method in workload:
+            method()
+
+
+def bench_sinks(calls: int = 20_000) -> None:
+    with use_sink(NullSink()):
+        workload = build_workload()
+
+    # Arquivo com buffer por linha, como a saída padrão em um terminal
+    output = TemporaryFile('w', buffering=1)
+    sinks: Dict[str, Callable[[], Sink]] = {
+        'buffered': lambda: BufferedSink(output),
+        'async': lambda: AsyncSink(output),
+        'capture': CaptureSink,
+        'null': NullSink,
+    }
+    lines = calls * len(workload)
+    results = []
+
+    previous, sys.stdout = sys.stdout, output
+    start = perf_counter()
+    run(workload, calls)
+    results.append(('print direto', perf_counter() - start))
+    sys.stdout = previous
+
+    for name, factory in sinks.items():
+        start = perf_counter()
+        with use_sink(factory()):
+            run(workload, calls)
+        results.append((name, perf_counter() - start))
+
+    output.close()
+
+    print(f'{lines} linhas escritas por métodos dos exemplos')
+    baseline = results[0][1]
+    for name, elapsed in results:
+        print(f'  {name:<13} {lines / elapsed:>12,.0f} linhas/s '
+              f'({baseline / elapsed:.1f}x)')
+
+
+if __name__ == "__main__":
+    bench_sinks()